@@ -0,0 +1,224 @@
+"""Async variant of SkillAgent for running many conversations in one process."""
+
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+from completion_cache import CompletionCache
+from skill_agent import MAX_TOOL_ITERATIONS, SCRIPT_TIMEOUT, SkillAgent, StreamAccumulator
+
+
+class AsyncSkillAgent(SkillAgent):
+    """
+    SkillAgent built on AsyncOpenAI and asyncio subprocesses.
+
+    Skills, tools and prompts behave exactly as in SkillAgent, but run() is
+    a coroutine and skill scripts are launched with
+    asyncio.create_subprocess_exec, so one event loop can drive dozens of
+    conversations at once without threads:
+
+        agent = AsyncSkillAgent(max_concurrent_requests=16)
+        answers = await asyncio.gather(
+            *(agent.run(f"Read the paper: {source}") for source in sources)
+        )
+        await agent.aclose()
+    """
+
+    def __init__(
+        self,
+        skills_dir: str = "claude_skills",
+        model: str = "gpt-4o-mini",
+        max_concurrent_requests: int | None = None,
+        retrieval: bool = False,
+        token_budget: int | None = None,
+        max_tool_workers: int = 4,
+        completion_cache: CompletionCache | None = None,
+        watch_skills: bool = False,
+    ):
+        super().__init__(
+            skills_dir=skills_dir,
+            model=model,
+            warm_scripts=False,
+            retrieval=retrieval,
+            token_budget=token_budget,
+            max_tool_workers=max_tool_workers,
+            completion_cache=completion_cache,
+            watch_skills=watch_skills,
+        )
+        self._request_slots = (
+            asyncio.Semaphore(max_concurrent_requests)
+            if max_concurrent_requests
+            else None
+        )
+        self._tool_slots = asyncio.Semaphore(max(1, max_tool_workers))
+
+    def _create_client(self):
+        return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+    async def _create_completion(self, on_token=None, **kwargs):
+        """Get a chat completion, from the completion cache when possible."""
+        # Cache files are small; reading them inline is cheaper than a thread hop
+        key = cached = None
+        if self.completion_cache is not None:
+            key = self.completion_cache.key(**kwargs)
+            cached = self.completion_cache.get(key)
+
+        if cached is not None:
+            response = ChatCompletion.model_validate(cached)
+            if on_token and response.choices[0].message.content:
+                on_token(response.choices[0].message.content)
+            return response
+
+        if on_token:
+            response = await self._stream_api(on_token, **kwargs)
+        else:
+            response = await self._call_api(**kwargs)
+
+        if key is not None:
+            self.completion_cache.put(key, response.model_dump(mode="json"))
+        return response
+
+    async def _call_api(self, **kwargs):
+        """Call the chat completions API, honouring max_concurrent_requests."""
+        if self._request_slots is None:
+            return await self.client.chat.completions.create(**kwargs)
+        async with self._request_slots:
+            return await self.client.chat.completions.create(**kwargs)
+
+    async def _stream_api(self, on_token, **kwargs) -> ChatCompletion:
+        """Stream a completion, forwarding text deltas to on_token."""
+        slots = self._request_slots or contextlib.nullcontext()
+        accumulator = StreamAccumulator()
+        async with slots:
+            stream = await self.client.chat.completions.create(
+                stream=True,
+                stream_options={"include_usage": True},
+                **kwargs,
+            )
+            async for chunk in stream:
+                text = accumulator.add(chunk)
+                if text:
+                    on_token(text)
+        return accumulator.result()
+
+    async def _execute_tool(
+        self,
+        tool_name: str,
+        arguments: dict,
+        messages: list[dict] | None = None,
+    ) -> str:
+        """Execute a tool; only run_script actually blocks, so only it is awaited."""
+        if tool_name == "run_script":
+            return await self._run_script(
+                arguments["skill_name"],
+                arguments["script_name"],
+                arguments.get("args", []),
+            )
+        return super()._execute_tool(tool_name, arguments, messages)
+
+    async def _timed_tool_call(self, tool_call, messages: list[dict] | None = None) -> str:
+        """Execute one tool call and record how long it took."""
+        async with self._tool_slots:
+            started = time.perf_counter()
+            result = await self._execute_tool(
+                tool_call.function.name,
+                json.loads(tool_call.function.arguments),
+                messages,
+            )
+            self._record_tool_timing(tool_call.function.name, time.perf_counter() - started)
+        return result
+
+    async def _execute_tool_calls(self, tool_calls, messages: list[dict] | None = None) -> list[str]:
+        """Execute one turn's tool calls concurrently; results keep call order."""
+        return await asyncio.gather(*(self._timed_tool_call(tc, messages) for tc in tool_calls))
+
+    async def _run_script(self, skill_name: str, script_name: str, args: list) -> str:
+        """Run a script from a skill's scripts directory in a subprocess."""
+        script_path, error = self._resolve_script(skill_name, script_name)
+        if error:
+            return error
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, str(script_path), *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=str(Path.cwd()),
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(),
+                    timeout=SCRIPT_TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return json.dumps({"error": "Script timed out"})
+
+            return self._script_result(
+                process.returncode,
+                stdout.decode("utf-8", errors="replace"),
+                stderr.decode("utf-8", errors="replace"),
+            )
+
+        except Exception as e:
+            return json.dumps({"error": str(e)})
+
+    async def run(
+        self,
+        user_input: str,
+        conversation_history: list[dict] | None = None,
+        on_token=None,
+        conversation_state: dict | None = None,
+    ) -> str:
+        """Process user input and return the agent's response (see SkillAgent.run)."""
+        if self.watch_skills:
+            # A stat per skill; cheap enough to run on the event loop
+            self.refresh_skills()
+
+        state = self._skill_state  # One snapshot for prompt and tools
+        messages = self._start_messages(user_input, conversation_history, state, conversation_state)
+        tools = state.tools
+
+        for _ in range(MAX_TOOL_ITERATIONS):
+            if self.token_budget:
+                messages = self._compact(messages)
+
+            response = await self._create_completion(
+                on_token=on_token,
+                model=self.model,
+                messages=messages,
+                tools=tools,
+                tool_choice="auto",
+            )
+
+            assistant_message = response.choices[0].message
+
+            if not assistant_message.tool_calls:
+                return assistant_message.content or ""
+
+            messages.append(self._assistant_entry(assistant_message))
+            self._record_active_skill(messages[-1], state, conversation_state)
+            if on_token and assistant_message.content:
+                on_token("\n\n")  # Separate this round's text from the next
+
+            results = await self._execute_tool_calls(assistant_message.tool_calls, messages)
+            for tool_call, result in zip(assistant_message.tool_calls, results):
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "content": result,
+                })
+
+        return "Max iterations reached."
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.client.close()
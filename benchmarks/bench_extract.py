@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Extraction benchmark - download_paper.extract_text throughput by paper size.
+
+Generates synthetic papers (benchmarks/synthetic_papers.py) and extracts
+each one in three modes:
+
+- serial:   extract_text with one worker
+- parallel: extract_text with --workers processes (papers shorter than
+            PARALLEL_MIN_PAGES still run serially, as in production)
+- cached:   a hit in the extraction cache, filled beforehand by a
+            separate process
+
+and in each of the text layouts given with --layouts (plain, blocks).
+
+Every measurement runs in a fresh subprocess so peak RSS is per run.
+Reported: median seconds, pages/sec, peak RSS of the extracting process and
+of its pool workers, the size of the JSON output and the number of sections
+found. Results are written as JSON so two versions can be compared with
+--compare.
+
+    python benchmarks/bench_extract.py --pages 10 40 120 --output before.json
+    python benchmarks/bench_extract.py --pages 10 40 120 --compare before.json
+    python benchmarks/bench_extract.py --layouts plain blocks --modes serial
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = ROOT / "claude_skills" / "paper-reader" / "scripts"
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from synthetic_papers import DEFAULT_CORPUS_DIR, generate_corpus  # noqa: E402
+
+MODES = ["serial", "parallel", "cached"]
+LAYOUTS = ["plain", "blocks"]
+
+
+def _max_rss_mb(who: int) -> float:
+    import resource
+
+    rss = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _child(spec: dict) -> dict:
+    """Run one extraction in this process and report its cost."""
+    import resource
+    import time
+
+    import download_paper
+
+    layout = spec["layout"]
+    if spec["mode"] == "fill":
+        # Runs in its own process before the cached runs, so their peak
+        # RSS is that of a cache hit alone
+        download_paper.extract_text_cached(spec["pdf"], spec["cache_dir"], workers=1, layout=layout)
+        return {}
+    if spec["mode"] == "cached":
+        started = time.perf_counter()
+        result = download_paper.extract_text_cached(spec["pdf"], spec["cache_dir"], layout=layout)
+    else:
+        workers = 1 if spec["mode"] == "serial" else spec["workers"]
+        # PyMuPDF is imported lazily by extract_text; keep that out of the timing
+        download_paper._import_fitz()
+        started = time.perf_counter()
+        result = download_paper.extract_text(spec["pdf"], workers=workers, layout=layout)
+    seconds = time.perf_counter() - started
+
+    return {
+        "seconds": seconds,
+        "output_bytes": len(json.dumps(result).encode("utf-8")),
+        "sections": len(result["sections"]),
+        "peak_rss_mb": _max_rss_mb(resource.RUSAGE_SELF),
+        "peak_worker_rss_mb": _max_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def _run_child(spec: dict) -> dict:
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", json.dumps(spec)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure(
+    pdf: Path, pages: int, mode: str, layout: str, workers: int, repeat: int, cache_dir: str
+) -> dict:
+    """Run one mode and layout repeat times, each in a fresh interpreter."""
+    spec = {
+        "mode": mode,
+        "layout": layout,
+        "pdf": str(pdf),
+        "workers": workers,
+        "cache_dir": cache_dir,
+    }
+    if mode == "cached":
+        _run_child({**spec, "mode": "fill"})
+    runs = [_run_child(spec) for _ in range(repeat)]
+
+    seconds = statistics.median(run["seconds"] for run in runs)
+    return {
+        "pages": pages,
+        "mode": mode,
+        "layout": layout,
+        "seconds": seconds,
+        "pages_per_sec": pages / seconds if seconds > 0 else None,
+        "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+        "peak_worker_rss_mb": max(run["peak_worker_rss_mb"] for run in runs),
+        "output_bytes": runs[-1]["output_bytes"],
+        "sections": runs[-1]["sections"],
+    }
+
+
+def _environment() -> dict:
+    import download_paper
+
+    fitz = download_paper._import_fitz()
+    return {
+        "python": platform.python_version(),
+        "pymupdf": fitz.VersionBind,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "extractor_version": download_paper.EXTRACTOR_VERSION,
+    }
+
+
+def compare(old: dict, new: dict) -> None:
+    """Print the speed and size change of every (pages, mode, layout) in both runs."""
+    # Results from before layouts were benchmarked are all plain
+    before = {(r["pages"], r["mode"], r.get("layout", "plain")): r for r in old["results"]}
+    print(f"\n{'pages':>6} {'mode':<9}{'layout':<7}{'speed':>10}{'rss':>10}{'output':>10}")
+    for result in new["results"]:
+        previous = before.get((result["pages"], result["mode"], result["layout"]))
+        if not previous:
+            continue
+        speed = previous["seconds"] / result["seconds"] if result["seconds"] else float("inf")
+        rss = result["peak_rss_mb"] - previous["peak_rss_mb"]
+        size = result["output_bytes"] - previous["output_bytes"]
+        print(f"{result['pages']:>6} {result['mode']:<9}{result['layout']:<7}"
+              f"{speed:>9.2f}x{rss:>+8.1f}MB{size:>+10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 40, 120],
+                        help="Page counts of the synthetic papers (default: 10 40 120)")
+    parser.add_argument("--columns", type=int, default=2)
+    parser.add_argument("--sections", type=int, default=6)
+    parser.add_argument("--references", type=int, default=40)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=["plain"],
+                        help="Text layouts to extract with (default: plain)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes for the parallel mode (default: one per CPU)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (default: 3)")
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR,
+                        help="Where generated papers are kept between runs")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Earlier JSON results to compare against")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child(json.loads(args.child))))
+        return
+
+    papers = generate_corpus(args.corpus_dir, args.pages, args.columns, args.sections,
+                             args.references)
+
+    results = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for pages, pdf in zip(args.pages, papers):
+            for layout in args.layouts:
+                for mode in args.modes:
+                    result = measure(pdf, pages, mode, layout, args.workers, args.repeat, cache_dir)
+                    results.append(result)
+                    print(f"{pages:>5} pages {mode:<9}{layout:<7}{result['seconds'] * 1000:>9.1f} ms"
+                          f"{result['pages_per_sec']:>9.0f} pages/s"
+                          f"{result['peak_rss_mb']:>8.0f} MB rss"
+                          f"{result['peak_worker_rss_mb']:>6.0f} MB workers"
+                          f"{result['output_bytes'] / 1024:>8.0f} KiB out"
+                          f"{result['sections']:>4} sections")
+
+    report = {
+        "environment": _environment(),
+        "config": {
+            "pages": args.pages,
+            "layouts": args.layouts,
+            "columns": args.columns,
+            "sections": args.sections,
+            "references": args.references,
+            "workers": args.workers,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
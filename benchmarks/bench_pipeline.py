@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Pipeline benchmark - end-to-end PaperAnalysisPipeline runs against a fake API.
+
+Starts benchmarks/fake_openai_server.py in-process, points the agent at it
+and runs the full pipeline over a fixed set of papers. Reported per step:
+wall time, time waiting on the API, time in tools, the remaining
+orchestration overhead, tokens, and (with --stream) time to first token.
+Overall throughput is reported in papers/min.
+
+Because the fake server's latency is fixed, changes in overhead and tool
+time point at our own code rather than at the API. Without paper sources,
+a fixed corpus of synthetic papers (benchmarks/synthetic_papers.py) is used.
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py paper1.pdf paper2.pdf --papers 2
+    python benchmarks/bench_pipeline.py --sources papers.txt --stream --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fake_openai_server import start_server  # noqa: E402
+from synthetic_papers import DEFAULT_CORPUS_DIR, generate_corpus  # noqa: E402
+from skill_agent import ANALYSIS_STEPS, PaperAnalysisPipeline, SkillAgent, read_sources  # noqa: E402
+
+STEP_PROMPTS = {prompt: key for key, _, prompt in ANALYSIS_STEPS}
+
+
+def _step_key(user_input: str) -> str:
+    if user_input.startswith("Read the paper:"):
+        return "read"
+    return STEP_PROMPTS.get(user_input, "other")
+
+
+class BenchAgent(SkillAgent):
+    """SkillAgent that records time and tokens for every run() call."""
+
+    def __init__(self, stream: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.stream = stream
+        self.step_records: list[dict] = []
+        self._local = threading.local()
+        self._records_lock = threading.Lock()
+
+    def run(self, user_input, conversation_history=None, on_token=None, conversation_state=None):
+        usage = self._local.usage = Counter()
+        first_token = []
+
+        def timed_token(text):
+            if not first_token:
+                first_token.append(time.perf_counter())
+            if on_token:
+                on_token(text)
+
+        started = time.perf_counter()
+        answer = super().run(
+            user_input,
+            conversation_history,
+            on_token=timed_token if self.stream or on_token else None,
+            conversation_state=conversation_state,
+        )
+        seconds = time.perf_counter() - started
+
+        record = {
+            "step": _step_key(user_input),
+            "seconds": seconds,
+            "api_seconds": usage["api_seconds"],
+            "tool_seconds": usage["tool_seconds"],
+            "overhead_seconds": seconds - usage["api_seconds"] - usage["tool_seconds"],
+            "requests": usage["requests"],
+            "prompt_tokens": usage["prompt_tokens"],
+            "completion_tokens": usage["completion_tokens"],
+        }
+        if first_token:
+            record["ttft_seconds"] = first_token[0] - started
+        with self._records_lock:
+            self.step_records.append(record)
+        return answer
+
+    def _create_completion(self, on_token=None, **kwargs):
+        started = time.perf_counter()
+        response = super()._create_completion(on_token=on_token, **kwargs)
+        usage = self._local.usage
+        usage["api_seconds"] += time.perf_counter() - started
+        usage["requests"] += 1
+        if response.usage:
+            usage["prompt_tokens"] += response.usage.prompt_tokens
+            usage["completion_tokens"] += response.usage.completion_tokens
+        return response
+
+    def _execute_tool_calls(self, tool_calls, messages=None):
+        # Tools may run on pool threads, so time the whole turn here
+        started = time.perf_counter()
+        results = super()._execute_tool_calls(tool_calls, messages)
+        self._local.usage["tool_seconds"] += time.perf_counter() - started
+        return results
+
+
+def _summarize(values: list[float]) -> dict:
+    return {
+        "mean": statistics.fmean(values),
+        "p50": statistics.median(values),
+        "max": max(values),
+    }
+
+
+def run_benchmark(
+    sources: list[str],
+    max_papers: int = 1,
+    concurrent: bool = False,
+    stream: bool = False,
+    latency: float = 0.05,
+    tokens_per_second: float | None = None,
+    response_tokens: int = 200,
+    model: str = "gpt-4o-mini",
+) -> dict:
+    """Run the pipeline over sources against a fake server; return the results."""
+    server = start_server(
+        latency=latency,
+        tokens_per_second=tokens_per_second,
+        response_tokens=response_tokens,
+    )
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    os.environ["OPENAI_API_KEY"] = "fake"
+
+    agent = BenchAgent(stream=stream, model=model, skills_dir=str(ROOT / "claude_skills"))
+    papers = []
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            pipeline = PaperAnalysisPipeline(agent, output_dir=output_dir)
+
+            def analyze(source: str) -> dict:
+                started = time.perf_counter()
+                record = {"source": source}
+                try:
+                    pipeline.run(source, verbose=False, concurrent=concurrent)
+                    record["status"] = "ok"
+                except Exception as e:
+                    record.update(status="error", error=str(e))
+                record["seconds"] = time.perf_counter() - started
+                return record
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max_papers) as pool:
+                papers = list(pool.map(analyze, sources))
+            elapsed = time.perf_counter() - started
+    finally:
+        agent.close()
+        server.shutdown()
+        server.server_close()
+
+    steps = {}
+    for key in ["read", *(key for key, _, _ in ANALYSIS_STEPS)]:
+        records = [r for r in agent.step_records if r["step"] == key]
+        if not records:
+            continue
+        steps[key] = {
+            "runs": len(records),
+            **{
+                metric: _summarize([r[metric] for r in records])
+                for metric in ("seconds", "api_seconds", "tool_seconds", "overhead_seconds")
+            },
+            "requests": sum(r["requests"] for r in records) / len(records),
+            "prompt_tokens": sum(r["prompt_tokens"] for r in records) / len(records),
+            "completion_tokens": sum(r["completion_tokens"] for r in records) / len(records),
+        }
+        if stream:
+            steps[key]["ttft_seconds"] = _summarize([r["ttft_seconds"] for r in records if "ttft_seconds" in r])
+
+    return {
+        "config": {
+            "papers": len(sources),
+            "max_papers": max_papers,
+            "concurrent": concurrent,
+            "stream": stream,
+            "latency": latency,
+            "tokens_per_second": tokens_per_second,
+            "response_tokens": response_tokens,
+        },
+        "elapsed_seconds": elapsed,
+        "papers_per_min": len(sources) / elapsed * 60 if elapsed > 0 else 0.0,
+        "succeeded": sum(1 for p in papers if p["status"] == "ok"),
+        "server": dict(server.stats),
+        "steps": steps,
+        "papers": papers,
+    }
+
+
+def _print_report(results: dict) -> None:
+    print(f"\n{'step':<14}{'wall':>9}{'api':>9}{'tools':>9}{'overhead':>10}"
+          f"{'prompt tok':>12}{'compl tok':>11}{'ttft':>8}")
+    for key, step in results["steps"].items():
+        ttft = f"{step['ttft_seconds']['mean'] * 1000:.0f}ms" if "ttft_seconds" in step else "-"
+        print(f"{key:<14}"
+              f"{step['seconds']['mean'] * 1000:>7.0f}ms"
+              f"{step['api_seconds']['mean'] * 1000:>7.0f}ms"
+              f"{step['tool_seconds']['mean'] * 1000:>7.0f}ms"
+              f"{step['overhead_seconds']['mean'] * 1000:>8.1f}ms"
+              f"{step['prompt_tokens']:>12.0f}{step['completion_tokens']:>11.0f}{ttft:>8}")
+
+    for paper in results["papers"]:
+        if paper["status"] != "ok":
+            print(f"error: {paper['source']}: {paper['error']}")
+    print(f"\n{results['succeeded']}/{results['config']['papers']} papers in "
+          f"{results['elapsed_seconds']:.2f}s ({results['papers_per_min']:.1f} papers/min), "
+          f"{results['server']['requests']} API requests")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline against a fake API.")
+    parser.add_argument("sources", nargs="*", help="Paper sources (PDF paths, arXiv IDs, URLs)")
+    parser.add_argument("--sources", dest="sources_file", help="File with one paper source per line")
+    parser.add_argument("--synthetic-pages", type=int, nargs="+", default=[6, 12, 24],
+                        help="Without sources: page counts of the synthetic corpus (default: 6 12 24)")
+    parser.add_argument("--papers", type=int, default=1, help="Papers analyzed at once (default: 1)")
+    parser.add_argument("--concurrent", action="store_true", help="Run pipeline steps 2-5 in parallel")
+    parser.add_argument("--stream", action="store_true", help="Stream completions and report time to first token")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Fake API seconds before the first token (default: 0.05)")
+    parser.add_argument("--tokens-per-second", type=float, default=None,
+                        help="Fake API generation speed (default: instant)")
+    parser.add_argument("--response-tokens", type=int, default=200,
+                        help="Words per fake text answer (default: 200)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    sources = list(args.sources)
+    if args.sources_file:
+        sources.extend(read_sources(args.sources_file))
+    if not sources:
+        sources = [str(path) for path in generate_corpus(DEFAULT_CORPUS_DIR, args.synthetic_pages)]
+
+    results = run_benchmark(
+        sources,
+        max_papers=args.papers,
+        concurrent=args.concurrent,
+        stream=args.stream,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        response_tokens=args.response_tokens,
+    )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_report(results)
+
+
+if __name__ == "__main__":
+    main()
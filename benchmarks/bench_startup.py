@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Startup benchmark - wall time and heaviest imports of the CLI entry points.
+
+Each command is run several times in a fresh interpreter with
+``python -X importtime``. The median wall time is reported together with
+the top-level imports that took longest, so a module that creeps back into
+import time shows up by name.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --pdf paper.pdf --repeat 10 --json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DOWNLOAD_SCRIPT = ROOT / "claude_skills" / "paper-reader" / "scripts" / "download_paper.py"
+
+
+def _commands(pdf: str | None) -> dict[str, list[str]]:
+    commands = {
+        "skill_agent --help": [str(ROOT / "skill_agent.py"), "--help"],
+        "download_paper --help": [str(DOWNLOAD_SCRIPT), "--help"],
+    }
+    if pdf:
+        commands["download_paper local"] = [str(DOWNLOAD_SCRIPT), "local", pdf, "--no-cache"]
+    return commands
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative microseconds per top-level import from -X importtime output."""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        # "import time: <self> | <cumulative> | <indented name>"
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        # Nested imports are indented by two spaces per level
+        if not name[1:].startswith(" "):
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def measure(argv: list[str], repeat: int) -> dict:
+    """Run one command repeat times and summarise wall time and imports."""
+    times = []
+    imports: dict[str, int] = {}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", *argv],
+            capture_output=True,
+            text=True,
+            cwd=str(ROOT),
+        )
+        times.append(time.perf_counter() - started)
+        # Keep the last run's import profile; the first may be a cold cache
+        imports = parse_importtime(completed.stderr)
+
+    return {
+        "median_seconds": statistics.median(times),
+        "min_seconds": min(times),
+        "import_seconds": sum(imports.values()) / 1e6,
+        "imports": imports,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI startup time.")
+    parser.add_argument("--pdf", help="Also time extracting this local PDF")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command (default: 5)")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list (default: 8)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for name, argv in _commands(args.pdf).items():
+        result = measure(argv, args.repeat)
+        slowest = sorted(result.pop("imports").items(), key=lambda item: item[1], reverse=True)
+        result["slowest_imports"] = [
+            {"module": module, "seconds": micros / 1e6}
+            for module, micros in slowest[:args.top]
+        ]
+        results[name] = result
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for name, result in results.items():
+        print(f"{name}: {result['median_seconds'] * 1000:.0f} ms median "
+              f"({result['import_seconds'] * 1000:.0f} ms in imports)")
+        for entry in result["slowest_imports"]:
+            print(f"    {entry['seconds'] * 1000:8.1f} ms  {entry['module']}")
+
+
+if __name__ == "__main__":
+    main()
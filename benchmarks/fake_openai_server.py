@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Fake OpenAI server - a local stand-in for the chat completions API.
+
+Answers ``POST /v1/chat/completions`` from a script instead of a model, so
+the agent and pipeline can be exercised and timed without an API key or
+network access. Latency and generation speed are configurable, and both
+plain JSON and streamed (server-sent events) responses are supported.
+
+A script is a list of rules matched, in order, against the latest user
+message. A rule's ``rounds`` are the tool calls to make: round N is
+answered after N tool-call rounds since that message. Once the rounds are
+used up (or if no rule matches) the server replies with text. Named groups
+in ``match`` can be used in tool arguments as ``{name}``; a ``source``
+group also provides ``{source_type}`` (arxiv, url or local).
+
+    python benchmarks/fake_openai_server.py --port 8765 --latency 0.3
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake \\
+        python skill_agent.py paper.pdf
+"""
+
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from token_budget import count_tokens, message_tokens  # noqa: E402
+
+
+def _use_skill(name: str) -> dict:
+    return {"name": "use_skill", "arguments": {"skill_name": name, "reason": "scripted"}}
+
+
+# Mirrors what a model typically does for each pipeline step: activate the
+# matching skill, and for the read step run the download script on the paper.
+DEFAULT_RULES = [
+    {
+        "match": r"read the paper:?\s*(?P<source>.+?)\s*$",
+        "rounds": [
+            [_use_skill("paper-reader")],
+            [{
+                "name": "run_script",
+                "arguments": {
+                    "skill_name": "paper-reader",
+                    "script_name": "download_paper.py",
+                    "args": ["{source_type}", "{source}"],
+                },
+            }],
+        ],
+    },
+    {"match": r"summary", "rounds": [[_use_skill("paper-summarizer")]]},
+    # Before "explain": the reproduction prompt also says "Explain why
+    # reproduction is not applicable".
+    {"match": r"reproduc", "rounds": [[_use_skill("paper-reproducer")]]},
+    {"match": r"analyze", "rounds": [[_use_skill("paper-analyzer")]]},
+    {"match": r"explain", "rounds": [[_use_skill("paper-explainer")]]},
+]
+
+FILLER = (
+    "The paper proposes a method evaluated on standard benchmarks and reports "
+    "consistent improvements over strong baselines while discussing limitations "
+    "and directions for future work"
+).split()
+
+
+def _source_type(source: str) -> str:
+    if source.lower().startswith(("http://", "https://")):
+        return "url"
+    if source.lower().startswith("arxiv:") or re.fullmatch(r"\d{4}\.\d{4,5}(v\d+)?", source):
+        return "arxiv"
+    return "local"
+
+
+def _fill(value, fields: dict):
+    """Substitute {field} placeholders throughout a JSON-like value."""
+    if isinstance(value, str):
+        return value.format(**fields)
+    if isinstance(value, list):
+        return [_fill(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {key: _fill(item, fields) for key, item in value.items()}
+    return value
+
+
+class Script:
+    """Decides the reply to a chat completion request."""
+
+    def __init__(self, rules: list[dict] | None = None, response_tokens: int = 200):
+        self.rules = [(re.compile(rule["match"], re.IGNORECASE), rule) for rule in rules or DEFAULT_RULES]
+        self.response_tokens = response_tokens
+
+    def reply(self, messages: list[dict]) -> dict:
+        """Return the assistant message (content or tool_calls) to send."""
+        last_user = max(i for i, m in enumerate(messages) if m["role"] == "user")
+        prompt = messages[last_user]["content"] or ""
+        round_num = sum(
+            1 for m in messages[last_user + 1:]
+            if m["role"] == "assistant" and m.get("tool_calls")
+        )
+
+        for pattern, rule in self.rules:
+            match = pattern.search(prompt)
+            if not match:
+                continue
+            rounds = rule.get("rounds", [])
+            if round_num < len(rounds):
+                fields = match.groupdict()
+                if "source" in fields:
+                    fields["source_type"] = _source_type(fields["source"])
+                return {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": f"call_{uuid.uuid4().hex[:12]}",
+                            "type": "function",
+                            "function": {
+                                "name": call["name"],
+                                "arguments": json.dumps(_fill(call["arguments"], fields)),
+                            },
+                        }
+                        for call in rounds[round_num]
+                    ],
+                }
+            break
+
+        words = [FILLER[i % len(FILLER)] for i in range(self.response_tokens)]
+        return {"role": "assistant", "content": f"Answer to: {prompt[:60]}\n\n" + " ".join(words)}
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """HTTP server holding the script, timing options and request counters."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        script: Script,
+        latency: float = 0.0,
+        tokens_per_second: float | None = None,
+    ):
+        super().__init__(address, _Handler)
+        self.script = script
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.stats = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count(self, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, Nagle's algorithm
+    # and delayed ACKs add ~40 ms to every response.
+    disable_nagle_algorithm = True
+    server: FakeOpenAIServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path: {self.path}"}})
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        model = request.get("model", "fake")
+        message = self.server.script.reply(request["messages"])
+
+        prompt_tokens = sum(message_tokens(m, model) for m in request["messages"])
+        generated = message["content"] or "".join(
+            tc["function"]["name"] + tc["function"]["arguments"] for tc in message["tool_calls"]
+        )
+        completion_tokens = count_tokens(generated, model)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        self.server.count(prompt_tokens, completion_tokens)
+
+        time.sleep(self.server.latency)  # Time to first token
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "created": int(time.time()),
+            "model": model,
+        }
+        finish_reason = "tool_calls" if message.get("tool_calls") else "stop"
+
+        if request.get("stream"):
+            include_usage = (request.get("stream_options") or {}).get("include_usage")
+            self._stream(base, message, finish_reason, usage if include_usage else None)
+            return
+
+        if self.server.tokens_per_second:
+            time.sleep(completion_tokens / self.server.tokens_per_second)
+        self._send_json(200, {
+            **base,
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": usage,
+        })
+
+    def _stream(self, base: dict, message: dict, finish_reason: str, usage: dict | None) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def chunk(delta: dict, finish: str | None = None) -> dict:
+            return {
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+
+        pieces = [{"role": "assistant", "content": ""}]
+        if message.get("tool_calls"):
+            for index, tool_call in enumerate(message["tool_calls"]):
+                pieces.append({"tool_calls": [{
+                    "index": index,
+                    "id": tool_call["id"],
+                    "type": "function",
+                    "function": {"name": tool_call["function"]["name"], "arguments": ""},
+                }]})
+                for part in re.findall(r".{1,16}", tool_call["function"]["arguments"], re.DOTALL):
+                    pieces.append({"tool_calls": [{"index": index, "function": {"arguments": part}}]})
+        else:
+            pieces.extend({"content": word} for word in re.findall(r"\S+\s*|\s+", message["content"]))
+
+        delay = 1 / self.server.tokens_per_second if self.server.tokens_per_second else 0
+        for delta in pieces:
+            self._send_event(chunk(delta))
+            if delay:
+                time.sleep(delay)
+        self._send_event(chunk({}, finish_reason))
+        if usage:
+            self._send_event({**base, "object": "chat.completion.chunk", "choices": [], "usage": usage})
+        self._send_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_event(self, data) -> None:
+        payload = data if isinstance(data, str) else json.dumps(data)
+        event = f"data: {payload}\n\n".encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+        self.wfile.flush()
+
+    def _send_json(self, status: int, data: dict) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    rules: list[dict] | None = None,
+    latency: float = 0.0,
+    tokens_per_second: float | None = None,
+    response_tokens: int = 200,
+) -> FakeOpenAIServer:
+    """Start a server on a background thread; port 0 picks a free port."""
+    server = FakeOpenAIServer(
+        (host, port),
+        Script(rules, response_tokens),
+        latency=latency,
+        tokens_per_second=tokens_per_second,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve scripted chat completions locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rules", help="JSON file with a list of rules (default: pipeline script)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=None,
+                        help="Generation speed (default: instant)")
+    parser.add_argument("--response-tokens", type=int, default=200,
+                        help="Length of text answers in words (default: 200)")
+    args = parser.parse_args()
+
+    rules = None
+    if args.rules:
+        with open(args.rules, encoding="utf-8") as f:
+            rules = json.load(f)
+
+    server = FakeOpenAIServer(
+        (args.host, args.port),
+        Script(rules, args.response_tokens),
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+    )
+    print(f"Serving fake chat completions at {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Synthetic papers - deterministic paper-like PDFs for benchmarks.
+
+Generates PDFs with PyMuPDF that look enough like papers to exercise the
+extractor: a large bold title, an abstract, numbered bold section headings
+laid out over one or more columns, and a references list. The same
+arguments always produce the same text, so results are comparable between
+runs and versions.
+
+    python benchmarks/synthetic_papers.py out/ --pages 10 40 120 --columns 2
+"""
+
+import argparse
+import os
+import random
+import tempfile
+from pathlib import Path
+
+# Generated papers are kept here and reused by the benchmarks
+DEFAULT_CORPUS_DIR = os.path.join(tempfile.gettempdir(), "synthetic_papers")
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US Letter, points
+MARGIN = 72
+COLUMN_GAP = 18
+
+TITLE_SIZE = 18
+HEADING_SIZE = 12
+BODY_SIZE = 10
+LINE_SPACING = 1.25
+
+SECTION_NAMES = [
+    "Introduction", "Related Work", "Background", "Method",
+    "Experiments", "Results", "Discussion", "Conclusion",
+]
+
+# Body vocabulary; deliberately free of section keywords so that no body
+# line is mistaken for a heading.
+WORDS = (
+    "model data training learning network layer attention token sequence "
+    "input output loss gradient parameter benchmark baseline accuracy task "
+    "representation feature sample batch optimization performance dataset "
+    "evaluation architecture encoder decoder embedding objective scale the "
+    "of and to in we our this that with for on by from is are which shows"
+).split()
+
+
+def _body_line(rng: random.Random, max_chars: int) -> str:
+    words = []
+    length = 0
+    while True:
+        word = rng.choice(WORDS)
+        if length + len(word) + 1 > max_chars:
+            return " ".join(words)
+        words.append(word)
+        length += len(word) + 1
+
+
+def _place(lines: list[tuple[str, int, bool]], front: int, columns: int, column_width: float):
+    """
+    Yield (page, x, y) for each line, flowing down each column in turn.
+
+    The first ``front`` lines (title, authors) span the full page width
+    above the columns of the first page.
+    """
+    page, column, y = 0, 0, MARGIN
+    column_top = MARGIN
+    for i, (_, size, _) in enumerate(lines):
+        height = size * LINE_SPACING
+        if i < front:
+            yield page, MARGIN, y
+            y += height
+            column_top = y + height  # Leave a blank line under the front matter
+            continue
+        if i == front:
+            y = column_top
+        if y + height > PAGE_HEIGHT - MARGIN:
+            column += 1
+            if column == columns:
+                page, column = page + 1, 0
+                column_top = MARGIN
+            y = column_top
+        yield page, MARGIN + column * (column_width + COLUMN_GAP), y
+        y += height
+
+
+def _layout(pages: int, columns: int, sections: int, references: int, seed: int):
+    """Return ([(text, fontsize, bold)], placements) filling exactly pages pages."""
+    column_width = (PAGE_WIDTH - 2 * MARGIN - COLUMN_GAP * (columns - 1)) / columns
+    max_chars = int(column_width / (BODY_SIZE * 0.5))
+    headings = ["Abstract"] + [
+        f"{i + 1} {SECTION_NAMES[i % len(SECTION_NAMES)]}" for i in range(sections)
+    ]
+
+    def build(per_section: int):
+        rng = random.Random(seed)
+        lines = [
+            (f"A Synthetic Study of {rng.choice(WORDS).title()} {rng.choice(WORDS).title()} Methods",
+             TITLE_SIZE, True),
+            ("Author One, Author Two", BODY_SIZE, False),
+        ]
+        for heading in headings:
+            lines.append((heading, HEADING_SIZE, True))
+            lines.extend((_body_line(rng, max_chars), BODY_SIZE, False) for _ in range(per_section))
+        lines.append(("References", HEADING_SIZE, True))
+        lines.extend(
+            (f"[{i + 1}] " + _body_line(rng, max_chars - 6).capitalize() + ".", BODY_SIZE, False)
+            for i in range(references)
+        )
+        placements = list(_place(lines, 2, columns, column_width))
+        return lines, placements
+
+    # Binary search for the longest sections that still fit in the pages
+    lines_per_column = int((PAGE_HEIGHT - 2 * MARGIN) / (BODY_SIZE * LINE_SPACING))
+    low, high = 1, max(2, 2 * pages * columns * lines_per_column // len(headings))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if build(middle)[1][-1][0] < pages:
+            low = middle
+        else:
+            high = middle - 1
+    return build(low)
+
+
+def generate_paper(
+    path: str | Path,
+    pages: int = 10,
+    columns: int = 1,
+    sections: int = 6,
+    references: int = 30,
+    seed: int = 0,
+) -> Path:
+    """
+    Write a synthetic paper to path and return the path.
+
+    Args:
+        pages: Number of pages; text is generated to fill them
+        columns: Text columns per page
+        sections: Numbered sections after the abstract
+        references: Entries in the references list
+        seed: Seed for the generated words
+    """
+    try:
+        import pymupdf as fitz
+    except ImportError:  # PyMuPDF < 1.24.3 only ships the fitz name
+        import fitz
+
+    lines, placements = _layout(pages, columns, sections, references, seed)
+
+    doc = fitz.open()
+    for _ in range(placements[-1][0] + 1):
+        doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    # One insert_text call per run of same-style lines in a column; calls
+    # per line make generating long papers slow.
+    run: list[str] = []
+    for i, ((text, size, bold), (page_num, x, y)) in enumerate(zip(lines, placements)):
+        if not run:
+            start = (page_num, x, y, size, bold)
+        run.append(text)
+        following = i + 1 < len(lines) and (
+            placements[i + 1][:2] == (page_num, x) and lines[i + 1][1:] == (size, bold)
+        )
+        if not following:
+            page_num, x, y, size, bold = start
+            doc[page_num].insert_text(
+                (x, y + size), run,
+                fontsize=size, fontname="hebo" if bold else "helv", lineheight=LINE_SPACING,
+            )
+            run = []
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc.save(str(path), garbage=3, deflate=True)
+    doc.close()
+    return path
+
+
+def generate_corpus(
+    out_dir: str | Path,
+    page_counts: list[int],
+    columns: int = 1,
+    sections: int = 6,
+    references: int = 30,
+    seed: int = 0,
+) -> list[Path]:
+    """Generate one paper per page count (reusing files already generated)."""
+    paths = []
+    for pages in page_counts:
+        path = Path(out_dir) / f"synthetic_{pages}p_{columns}col_s{sections}_r{references}_{seed}.pdf"
+        if not path.exists():
+            generate_paper(path, pages, columns, sections, references, seed)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic paper PDFs.")
+    parser.add_argument("out_dir", nargs="?", default=DEFAULT_CORPUS_DIR,
+                        help="Directory to write PDFs to (default: %(default)s)")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10], help="Page counts, one paper each")
+    parser.add_argument("--columns", type=int, default=1)
+    parser.add_argument("--sections", type=int, default=6)
+    parser.add_argument("--references", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for path in generate_corpus(args.out_dir, args.pages, args.columns, args.sections,
+                                args.references, args.seed):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,24 +5,84 @@ import sys
 import os
 import json
 import re
+import argparse
+import hashlib
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from pathlib import Path
 
-import fitz  # PyMuPDF
-import requests
-import arxiv
+# fitz (PyMuPDF), requests and arxiv are imported inside the functions that
+# use them, so a local PDF never loads the network stack and a cache hit
+# never loads PyMuPDF.
 
 
-def download_arxiv(arxiv_id: str, cache_dir: str) -> str:
-    """Download a paper from arXiv."""
-    # Clean up arxiv ID
-    arxiv_id = arxiv_id.lower().replace("arxiv:", "").strip()
+def _import_fitz():
+    """Import PyMuPDF, preferring the name that does not print a warning."""
+    try:
+        import pymupdf as fitz
+    except ImportError:  # PyMuPDF < 1.24.3 only ships the fitz name
+        import fitz
+    return fitz
+
+
+def _arxiv_pdf_url(arxiv_id: str) -> str:
+    # Unversioned IDs resolve to the latest version, so revalidating them
+    # picks up new revisions.
+    return f"https://arxiv.org/pdf/{arxiv_id}"
+
 
-    cache_path = os.path.join(cache_dir, f"arxiv_{arxiv_id}.pdf")
+def _normalize_arxiv_id(arxiv_id: str) -> str:
+    """Clean up an arXiv ID ("arXiv:2301.00001" -> "2301.00001")."""
+    return arxiv_id.lower().replace("arxiv:", "").strip()
+
+
+def _arxiv_cache_paths(arxiv_id: str, cache_dir: str) -> tuple[str, str]:
+    """Return the (pdf, metadata) cache paths for a normalized arXiv ID."""
+    # Old-style IDs contain a slash (hep-th/9901001)
+    stem = f"arxiv_{arxiv_id.replace('/', '_')}"
+    return os.path.join(cache_dir, f"{stem}.pdf"), os.path.join(cache_dir, f"{stem}.json")
+
+
+def _fetch_arxiv_pdf(
+    arxiv_id: str,
+    cache_dir: str,
+    title: str | None = None,
+    progress=None,
+) -> str:
+    """Stream an arXiv PDF into the cache and write its metadata sidecar."""
+    cache_path, meta_path = _arxiv_cache_paths(arxiv_id, cache_dir)
+    url = _arxiv_pdf_url(arxiv_id)
+    headers = _stream_download(url, cache_path, progress=progress)
+    _write_cache_metadata(meta_path, url, cache_path, headers, title=title)
+    return cache_path
+
+
+def download_arxiv(
+    arxiv_id: str,
+    cache_dir: str,
+    revalidate: bool = False,
+    progress=None,
+) -> str:
+    """
+    Download a paper from arXiv.
+
+    With ``revalidate``, a cached PDF is checked against arXiv with a
+    conditional request and only re-downloaded if it changed.
+    """
+    arxiv_id = _normalize_arxiv_id(arxiv_id)
+    cache_path, meta_path = _arxiv_cache_paths(arxiv_id, cache_dir)
 
     if os.path.exists(cache_path):
+        if revalidate:
+            metadata = read_cache_metadata(meta_path) or {}
+            url = metadata.get("url") or _arxiv_pdf_url(arxiv_id)
+            _revalidate(url, cache_path, meta_path, progress=progress)
         return cache_path
 
+    import arxiv
+
     # Search for the paper
     search = arxiv.Search(id_list=[arxiv_id])
     results = list(search.results())
@@ -30,123 +90,1242 @@ def download_arxiv(arxiv_id: str, cache_dir: str) -> str:
     if not results:
         raise ValueError(f"arXiv paper not found: {arxiv_id}")
 
-    paper = results[0]
-    paper.download_pdf(dirpath=cache_dir, filename=f"arxiv_{arxiv_id}.pdf")
+    return _fetch_arxiv_pdf(arxiv_id, cache_dir, title=results[0].title, progress=progress)
 
-    return cache_path
 
+# Downloads are streamed to disk in chunks of this size.
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# How many times an interrupted download is resumed before giving up.
+DOWNLOAD_RETRIES = 3
+
+
+def _resume_validator(part_meta_path: str) -> str | None:
+    """
+    The If-Range value for resuming a partial download, or None.
+
+    Weak ETags are not allowed in If-Range, so they fall back to
+    Last-Modified.
+    """
+    metadata = read_cache_metadata(part_meta_path) or {}
+    etag = metadata.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return metadata.get("last_modified")
+
+
+def _stream_download(
+    url: str,
+    dest_path: str,
+    progress=None,
+    retries: int = DOWNLOAD_RETRIES,
+    conditional_headers: dict | None = None,
+):
+    """
+    Stream ``url`` into ``dest_path`` without buffering it in memory.
+
+    Bytes go to ``dest_path + ".part"``, which is renamed into place only
+    once complete. The validators (ETag / Last-Modified) of the response
+    that started it are kept in ``dest_path + ".part.json"``. An existing
+    partial file, whether left by an earlier attempt in this call or by a
+    previous run, is resumed with an HTTP Range request guarded by
+    If-Range, so a resource that changed in between is sent whole instead
+    of being spliced onto the old bytes. A partial file without usable
+    validators is discarded; servers that ignore Range simply send the
+    whole file again.
+
+    ``progress``, if given, is called after each chunk as
+    ``progress(downloaded_bytes, total_bytes_or_None, bytes_per_second)``.
+
+    ``conditional_headers`` (If-None-Match / If-Modified-Since) turn the
+    request into a revalidation: a 304 leaves ``dest_path`` untouched.
+
+    Returns the headers of the final response, or None on 304 Not Modified.
+    """
+    import requests
+
+    part_path = dest_path + ".part"
+    part_meta_path = part_path + ".json"
+
+    for attempt in range(retries + 1):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = dict(conditional_headers or {})
+        if offset:
+            validator = _resume_validator(part_meta_path)
+            if validator:
+                headers["Range"] = f"bytes={offset}-"
+                headers["If-Range"] = validator
+            else:
+                # No way to tell whether the partial file is still current
+                os.remove(part_path)
+                offset = 0
+
+        try:
+            with requests.get(url, headers=headers, stream=True, timeout=60) as response:
+                if response.status_code == 304:
+                    return None
+                if response.status_code == 416 and offset:
+                    # Partial file no longer matches the resource; start over.
+                    os.remove(part_path)
+                    continue
+                response.raise_for_status()
+
+                content_range = response.headers.get("Content-Range", "")
+                if response.status_code == 206 and content_range.startswith(f"bytes {offset}-"):
+                    mode = 'ab'
+                else:
+                    mode = 'wb'
+                    offset = 0
+                    _write_json_atomic(part_meta_path, {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    })
+
+                length = response.headers.get("Content-Length")
+                total = offset + int(length) if length else None
 
-def download_url(url: str, cache_dir: str) -> str:
-    """Download a PDF from a URL."""
-    filename = url.split('/')[-1]
-    if not filename.endswith('.pdf'):
-        filename = f"{hash(url) & 0xFFFFFFFF}.pdf"
+                downloaded = offset
+                started = time.monotonic()
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        if progress:
+                            elapsed = time.monotonic() - started
+                            rate = (downloaded - offset) / elapsed if elapsed > 0 else 0.0
+                            progress(downloaded, total, rate)
 
-    cache_path = os.path.join(cache_dir, filename)
+                if total is not None and downloaded < total:
+                    raise requests.ConnectionError(
+                        f"Connection closed after {downloaded} of {total} bytes"
+                    )
+
+            os.replace(part_path, dest_path)
+            os.remove(part_meta_path)
+            return response.headers
+
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+            if attempt == retries:
+                raise
+
+    raise requests.ConnectionError(f"Download failed after {retries + 1} attempts: {url}")
+
+
+def _write_json_atomic(path: str, data: dict) -> None:
+    """Write JSON via a temp file + rename so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _url_cache_paths(url: str, cache_dir: str) -> tuple[str, str]:
+    """
+    Return the (pdf, metadata) cache paths for a URL.
+
+    Files are named by the SHA-256 of the URL, which is stable across
+    processes (unlike hash()) and cannot collide for URLs sharing a
+    basename.
+    """
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    url_dir = os.path.join(cache_dir, "urls")
+    return os.path.join(url_dir, f"{key}.pdf"), os.path.join(url_dir, f"{key}.json")
+
+
+def read_cache_metadata(meta_path: str) -> dict | None:
+    """Load a cache sidecar file, or None if it is missing or unreadable."""
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_cache_metadata(
+    meta_path: str,
+    url: str,
+    pdf_path: str,
+    headers,
+    title: str | None = None,
+) -> dict:
+    """Record where a cached PDF came from and its HTTP validators."""
+    metadata = {
+        "url": url,
+        "title": title,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "size": os.path.getsize(pdf_path),
+        "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    _write_json_atomic(meta_path, metadata)
+    return metadata
+
+
+def _revalidate(url: str, cache_path: str, meta_path: str, progress=None) -> bool:
+    """
+    Revalidate a cached PDF with a conditional GET using its stored validators.
+
+    The file is only re-downloaded (and atomically replaced) when the server
+    answers 200. Returns True if the cached copy changed.
+    """
+    metadata = read_cache_metadata(meta_path) or {}
+
+    conditional_headers = {}
+    if metadata.get("etag"):
+        conditional_headers["If-None-Match"] = metadata["etag"]
+    if metadata.get("last_modified"):
+        conditional_headers["If-Modified-Since"] = metadata["last_modified"]
+
+    # A leftover partial file belongs to an older download; never splice it
+    # onto a revalidated copy.
+    part_path = cache_path + ".part"
+    for path in (part_path, part_path + ".json"):
+        if os.path.exists(path):
+            os.remove(path)
+
+    headers = _stream_download(
+        url,
+        cache_path,
+        progress=progress,
+        conditional_headers=conditional_headers,
+    )
+
+    if headers is None:
+        metadata["checked_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        _write_json_atomic(meta_path, metadata)
+        return False
+
+    _write_cache_metadata(meta_path, url, cache_path, headers, title=metadata.get("title"))
+    return True
+
+
+def download_url(
+    url: str,
+    cache_dir: str,
+    progress=None,
+    revalidate: bool = False,
+) -> str:
+    """
+    Download a PDF from a URL, streaming it into the cache.
+
+    The PDF is cached as ``urls/<sha256(url)>.pdf`` next to a
+    ``<sha256(url)>.json`` sidecar holding the URL, ETag, Last-Modified,
+    size and fetch time. With ``revalidate``, a cached PDF is checked with a
+    conditional request and only re-downloaded if the server sends a new copy.
+    """
+    cache_path, meta_path = _url_cache_paths(url, cache_dir)
 
     if os.path.exists(cache_path):
+        if revalidate:
+            _revalidate(url, cache_path, meta_path, progress=progress)
         return cache_path
 
-    response = requests.get(url, timeout=60)
-    response.raise_for_status()
-
-    with open(cache_path, 'wb') as f:
-        f.write(response.content)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    headers = _stream_download(url, cache_path, progress=progress)
+    _write_cache_metadata(meta_path, url, cache_path, headers)
 
     return cache_path
 
 
-def extract_text(pdf_path: str) -> dict:
-    """Extract text and metadata from a PDF."""
-    doc = fitz.open(pdf_path)
+# IDs per arXiv API query in download_arxiv_batch; very long id_lists make
+# the query URL too long for the API.
+ARXIV_BATCH_SIZE = 100
 
-    full_text = []
-    sections = []
-    current_section = {"title": "Beginning", "content": []}
+# Concurrent PDF downloads in download_arxiv_batch. arXiv asks clients to
+# be gentle, so keep this small.
+ARXIV_DOWNLOAD_WORKERS = 4
+
+
+# Normalized arXiv IDs: new style (2301.00001v2) and old style
+# (hep-th/9901001, math.gt/0309136). arXiv rejects a whole id_list query
+# if any ID in it is malformed.
+ARXIV_ID_PATTERN = re.compile(r'(\d{4}\.\d{4,5}|[a-z][a-z-]*(\.[a-z]{2})?/\d{7})(v\d+)?')
+
+
+def _strip_arxiv_version(arxiv_id: str) -> str:
+    return re.sub(r'v\d+$', '', arxiv_id)
+
+
+def download_arxiv_batch(
+    arxiv_ids: list[str],
+    cache_dir: str,
+    chunk_size: int = ARXIV_BATCH_SIZE,
+    max_workers: int = ARXIV_DOWNLOAD_WORKERS,
+    client=None,
+) -> dict[str, dict]:
+    """
+    Download many arXiv papers with one metadata query per chunk of IDs.
+
+    IDs already in the cache are skipped entirely, and malformed IDs are
+    never queried. The rest are resolved ``chunk_size`` at a time through
+    a single ``id_list`` search each, then their PDFs are downloaded by a
+    pool of ``max_workers`` threads. A chunk whose query fails marks only
+    its own IDs as errors.
+
+    ``client`` defaults to ``arxiv.Client()``; anything with a compatible
+    ``results(search)`` method can be passed instead.
+
+    Returns a dict keyed by normalized ID, in input order, mapping to
+    ``{"pdf_path": ..., "title": ...}`` or ``{"error": ...}``.
+    """
+    ids = list(dict.fromkeys(_normalize_arxiv_id(i) for i in arxiv_ids if i.strip()))
+    results: dict[str, dict] = {arxiv_id: {} for arxiv_id in ids}
+
+    missing = []
+    for arxiv_id in ids:
+        cache_path, meta_path = _arxiv_cache_paths(arxiv_id, cache_dir)
+        if not ARXIV_ID_PATTERN.fullmatch(arxiv_id):
+            results[arxiv_id] = {"error": f"Invalid arXiv ID: {arxiv_id}"}
+        elif os.path.exists(cache_path):
+            metadata = read_cache_metadata(meta_path) or {}
+            results[arxiv_id] = {"pdf_path": cache_path, "title": metadata.get("title")}
+        else:
+            missing.append(arxiv_id)
+
+    if not missing:
+        return results
+
+    import arxiv
+
+    if client is None:
+        client = arxiv.Client()
+
+    found = {}
+    failed = {}
+    for start in range(0, len(missing), chunk_size):
+        chunk = missing[start:start + chunk_size]
+        search = arxiv.Search(id_list=chunk, max_results=len(chunk))
+        try:
+            papers = list(client.results(search))
+        except Exception as e:
+            # One failed query (HTTP 400, retries exhausted) only costs its chunk
+            failed.update((arxiv_id, f"arXiv query failed: {e}") for arxiv_id in chunk)
+            continue
+        for paper in papers:
+            short_id = paper.get_short_id().lower()
+            found[short_id] = paper
+            found.setdefault(_strip_arxiv_version(short_id), paper)
+
+    to_download = []
+    for arxiv_id in missing:
+        paper = found.get(arxiv_id)
+        if arxiv_id in failed:
+            results[arxiv_id] = {"error": failed[arxiv_id]}
+        elif paper is None:
+            results[arxiv_id] = {"error": f"arXiv paper not found: {arxiv_id}"}
+        else:
+            to_download.append((arxiv_id, paper.title))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_fetch_arxiv_pdf, arxiv_id, cache_dir, title): (arxiv_id, title)
+            for arxiv_id, title in to_download
+        }
+        for future in as_completed(futures):
+            arxiv_id, title = futures[future]
+            try:
+                results[arxiv_id] = {"pdf_path": future.result(), "title": title}
+            except Exception as e:
+                results[arxiv_id] = {"error": str(e)}
+
+    return results
+
+
+def _read_id_list(source: str) -> list[str]:
+    """Read arXiv IDs from a file (one per line, # comments) or a comma/space list."""
+    if os.path.isfile(source):
+        with open(source, encoding="utf-8") as f:
+            lines = [line.split("#", 1)[0] for line in f]
+        return [line.strip() for line in lines if line.strip()]
+    return [item for item in re.split(r'[,\s]+', source) if item]
+
+
+# Documents shorter than this are always extracted serially: starting a
+# process pool costs more than it saves on a handful of pages.
+PARALLEL_MIN_PAGES = 40
+
+# Common section headers
+SECTION_PATTERN = re.compile(
+    r'^(?:\d+\.?\s*)?(abstract|introduction|related\s*work|background|'
+    r'methodology|method|methods|approach|experiments?|results?|'
+    r'discussion|conclusion|conclusions|references|acknowledgements?|appendix)',
+    re.IGNORECASE
+)
+
+
+# Page text extraction modes:
+# - plain: PyMuPDF's text in content-stream order; every line is checked
+#   against SECTION_PATTERN
+# - blocks: text blocks ordered by column from their bounding boxes; only
+#   lines set larger or bolder than the body text can be section headers
+LAYOUTS = ("plain", "blocks")
+
+# A line set at least this much larger than the page's body text, or bold
+# when the body is not, is a heading.
+HEADING_SIZE_RATIO = 1.15
+
+# Headings are short; longer bold lines are emphasised body text.
+HEADING_MAX_CHARS = 80
+
+
+def _is_bold(span: dict) -> bool:
+    # Flag bit 4 is bold; base-14 fonts only say so in their name
+    return bool(span["flags"] & 16) or "bold" in span["font"].lower()
+
+
+def _order_lines(blocks: list[dict]) -> list[dict]:
+    """
+    Return the lines of a page's text blocks in reading order.
+
+    Blocks crossing the middle of the text area (titles, single-column
+    text, full-width captions) cut the page into bands; within a band the
+    left column is read top to bottom before the right one. A block that
+    crosses the middle only because MuPDF merged lines from both columns
+    (content streams that alternate between columns) is split into its
+    lines first.
+    """
+    if not blocks:
+        return []
+    middle = (
+        min(block["bbox"][0] for block in blocks)
+        + max(block["bbox"][2] for block in blocks)
+    ) / 2
+
+    def spans_middle(item: dict) -> bool:
+        return item["bbox"][0] < middle < item["bbox"][2]
+
+    units = []
+    for block in blocks:
+        if spans_middle(block) and not all(spans_middle(line) for line in block["lines"]):
+            units.extend({"bbox": line["bbox"], "lines": [line]} for line in block["lines"])
+        else:
+            units.append(block)
+
+    ordered, band = [], []
+
+    def flush() -> None:
+        # Left column first, each column top to bottom
+        band.sort(key=lambda u: (u["bbox"][0] >= middle, u["bbox"][1], u["bbox"][0]))
+        ordered.extend(band)
+        band.clear()
+
+    for unit in sorted(units, key=lambda u: (u["bbox"][1], u["bbox"][0])):
+        if spans_middle(unit):
+            flush()
+            ordered.append(unit)
+        else:
+            band.append(unit)
+    flush()
+    return [line for unit in ordered for line in unit["lines"]]
+
+
+def _page_blocks(page) -> tuple[str, list[int] | None]:
+    """
+    Extract a page in the blocks layout.
+
+    Returns the page text, one line per text line as in plain mode, and the
+    indices of its heading lines. A page set in a single style has nothing
+    to tell headings apart by, so its headings are None and every line is
+    a candidate, as in plain mode.
+    """
+    fitz = _import_fitz()
+    blocks = [
+        block
+        for block in page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)["blocks"]
+        if block["type"] == 0
+    ]
+
+    # Body style: the size and weight covering the most characters
+    styles: dict[tuple[float, bool], int] = {}
+    for block in blocks:
+        for line in block["lines"]:
+            for span in line["spans"]:
+                style = (round(span["size"], 1), _is_bold(span))
+                styles[style] = styles.get(style, 0) + len(span["text"])
+    body_size, body_bold = max(styles, key=styles.get) if styles else (0.0, False)
+
+    lines, headings = [], []
+    for line in _order_lines(blocks):
+        spans = [span for span in line["spans"] if span["text"].strip()]
+        text = "".join(span["text"] for span in line["spans"])
+        if not spans:
+            if text:
+                lines.append(text)
+            continue
+        size = max(span["size"] for span in spans)
+        bold = all(_is_bold(span) for span in spans)
+        if len(text.strip()) <= HEADING_MAX_CHARS and (
+            size >= body_size * HEADING_SIZE_RATIO or (bold and not body_bold)
+        ):
+            headings.append(len(lines))
+        lines.append(text)
+    text = "".join(line + "\n" for line in lines)
+    return text, headings if len(styles) > 1 else None
+
+
+def _page_text(page, layout: str = "plain") -> tuple[str, list[int] | None]:
+    """Return a page's text and heading line indices (None in plain mode)."""
+    if layout == "plain":
+        return page.get_text(), None
+    if layout == "blocks":
+        return _page_blocks(page)
+    raise ValueError(f"Unknown layout: {layout}")
+
+
+def _extract_page_range(
+    pdf_path: str, start: int, stop: int, layout: str = "plain"
+) -> list[tuple[str, list[int] | None]]:
+    """Extract pages [start, stop) with _page_text. Runs in pool workers."""
+    doc = _import_fitz().open(pdf_path)
+    try:
+        return [_page_text(doc[page_num], layout) for page_num in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def _page_ranges(num_pages: int, workers: int) -> list[tuple[int, int]]:
+    """Split the page range into contiguous chunks for the worker pool."""
+    # A few chunks per worker keeps the pool busy when page cost is uneven
+    # (figure-heavy pages, scanned appendices).
+    chunk_size = max(1, -(-num_pages // (workers * 4)))
+    return [
+        (start, min(start + chunk_size, num_pages))
+        for start in range(0, num_pages, chunk_size)
+    ]
+
+
+def _detect_title(first_page_text: str) -> str | None:
+    """Guess the paper title from the first lines of the first page."""
+    lines = first_page_text.strip().split('\n')
+    for line in lines[:5]:  # Check first 5 lines
+        line = line.strip()
+        if len(line) > 10 and len(line) < 200:
+            return line
+    return None
+
+
+# Separator between pages in the merged "text" field
+PAGE_SEPARATOR = "\n\n"
 
-    # Common section headers
-    section_pattern = re.compile(
-        r'^(?:\d+\.?\s*)?(abstract|introduction|related\s*work|background|'
-        r'methodology|method|methods|approach|experiments?|results?|'
-        r'discussion|conclusion|conclusions|references|acknowledgements?|appendix)',
-        re.IGNORECASE
-    )
 
-    title = None
+class _SectionSplitter:
+    """
+    Incremental section splitter: feed pages in order and get each section
+    back as soon as the next header closes it.
 
-    for page_num, page in enumerate(doc):
-        text = page.get_text()
-        full_text.append(text)
+    Each section records the 1-based page it starts on and its [start, end)
+    character range in PAGE_SEPARATOR.join(page_texts), header included.
+    """
 
-        # Try to get title from first page
-        if page_num == 0 and not title:
-            lines = text.strip().split('\n')
-            for line in lines[:5]:  # Check first 5 lines
-                line = line.strip()
-                if len(line) > 10 and len(line) < 200:
-                    title = line
-                    break
+    def __init__(self, first_page: int = 1):
+        # first_page is the page the text starts on, for partial reads
+        self.offset = 0
+        self.current = {"title": "Beginning", "page": first_page, "start": 0, "content": []}
 
-        # Identify sections
-        for line in text.split('\n'):
+    def _close(self, end: int) -> list[dict]:
+        section = self.current
+        if not section["content"]:
+            return []
+        section["end"] = end
+        section["content"] = "\n".join(section.pop("content"))
+        return [section]
+
+    def feed(self, page_num: int, text: str, headings: list[int] | None = None) -> list[dict]:
+        """
+        Add the next page; return the sections it closed.
+
+        With ``headings`` (line indices from the blocks layout) only those
+        lines can start a section; otherwise every line is a candidate.
+        """
+        closed = []
+        line_offset = self.offset
+        candidates = None if headings is None else set(headings)
+        for i, line in enumerate(text.split('\n')):
             line_stripped = line.strip()
-            match = section_pattern.match(line_stripped)
+            match = (
+                SECTION_PATTERN.match(line_stripped)
+                if candidates is None or i in candidates
+                else None
+            )
             if match:
-                if current_section["content"]:
-                    current_section["content"] = "\n".join(current_section["content"])
-                    sections.append(current_section)
-                current_section = {"title": line_stripped, "content": []}
+                closed.extend(self._close(line_offset))
+                self.current = {
+                    "title": line_stripped,
+                    "page": page_num,
+                    "start": line_offset,
+                    "content": [],
+                }
             else:
                 if line_stripped:
-                    current_section["content"].append(line_stripped)
+                    self.current["content"].append(line_stripped)
+            line_offset += len(line) + 1
+        self.offset += len(text) + len(PAGE_SEPARATOR)
+        return closed
+
+    def finish(self) -> list[dict]:
+        """Close the final section."""
+        return self._close(max(self.offset - len(PAGE_SEPARATOR), 0))
+
+
+def _split_sections(
+    page_texts: list[str], page_headings: list[list[int] | None] | None = None
+) -> list[dict]:
+    """Split the merged page stream into sections at recognised headers."""
+    splitter = _SectionSplitter()
+    sections = []
+    page_headings = page_headings or [None] * len(page_texts)
+    for page_num, (text, headings) in enumerate(zip(page_texts, page_headings), start=1):
+        sections.extend(splitter.feed(page_num, text, headings))
+    sections.extend(splitter.finish())
+    return sections
+
+
+def render_view(result: dict, view: str = "full") -> dict:
+    """
+    Shape an extraction result for output.
 
-    # Add final section
-    if current_section["content"]:
-        current_section["content"] = "\n".join(current_section["content"])
-        sections.append(current_section)
+    - full: text plus every section's content (the text appears twice)
+    - compact: text once; sections carry only title, page and offsets
+    - text: text only
+    - sections: section contents only
+    """
+    if view == "full":
+        return result
+    if view == "compact":
+        sections = [
+            {key: value for key, value in section.items() if key != "content"}
+            for section in result["sections"]
+        ]
+        return {**result, "sections": sections}
+    if view == "text":
+        return {key: value for key, value in result.items() if key != "sections"}
+    if view == "sections":
+        return {key: value for key, value in result.items() if key != "text"}
+    raise ValueError(f"Unknown view: {view}")
 
+
+def extract_text(pdf_path: str, workers: int | None = None, layout: str = "plain") -> dict:
+    """
+    Extract text and metadata from a PDF.
+
+    Pages are extracted in parallel across ``workers`` processes (default:
+    one per CPU), each opening its own copy of the document. Documents with
+    fewer than PARALLEL_MIN_PAGES pages, or ``workers`` <= 1, are extracted
+    serially. ``layout`` is one of LAYOUTS.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    doc = _import_fitz().open(pdf_path)
     num_pages = len(doc)
-    doc.close()
+
+    if workers <= 1 or num_pages < PARALLEL_MIN_PAGES:
+        try:
+            pages = [_page_text(page, layout) for page in doc]
+        finally:
+            doc.close()
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # Pulls in multiprocessing
+
+        doc.close()
+        ranges = _page_ranges(num_pages, workers)
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+            chunks = pool.map(
+                _extract_page_range,
+                [pdf_path] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+                [layout] * len(ranges),
+            )
+            pages = [page for chunk in chunks for page in chunk]
+
+    page_texts = [text for text, _ in pages]
+    title = _detect_title(page_texts[0]) if page_texts else None
 
     return {
         "title": title,
         "pdf_path": pdf_path,
         "pages": num_pages,
-        "text": "\n\n".join(full_text),
-        "sections": sections,
+        "text": PAGE_SEPARATOR.join(page_texts),
+        "sections": _split_sections(page_texts, [headings for _, headings in pages]),
     }
 
 
-def main():
-    if len(sys.argv) < 3:
-        print(json.dumps({
-            "error": "Usage: download_paper.py <arxiv|local|url> <source>"
-        }))
+# Pages per pool task when streaming; small batches keep memory flat.
+STREAM_BATCH_PAGES = 16
+
+
+def _iter_pages_parallel(pdf_path: str, num_pages: int, workers: int, layout: str = "plain"):
+    """Yield (text, headings) per page in order, a bounded number of batches ahead."""
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor  # Pulls in multiprocessing
+
+    starts = iter(range(0, num_pages, STREAM_BATCH_PAGES))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        def submit() -> None:
+            start = next(starts, None)
+            if start is not None:
+                stop = min(start + STREAM_BATCH_PAGES, num_pages)
+                pending.append(pool.submit(_extract_page_range, pdf_path, start, stop, layout))
+
+        for _ in range(2 * workers):
+            submit()
+        while pending:
+            texts = pending.popleft().result()
+            submit()
+            yield from texts
+
+
+def iter_extraction(
+    pdf_path: str,
+    workers: int | None = None,
+    view: str = "full",
+    layout: str = "plain",
+):
+    """
+    Extract a PDF as a stream of records, yielded as soon as they are known.
+
+    - ``{"type": "document", "title", "pdf_path", "pages"}`` comes first
+    - ``{"type": "page", "page", "start", "text"}`` for every page
+    - ``{"type": "section", "title", "page", "start", "end", "content"}``
+      as soon as the next header (or the end of the document) closes it
+    - ``{"type": "end", "pages", "sections"}`` comes last
+
+    Offsets index PAGE_SEPARATOR.join of all page texts, as in extract_text.
+    ``view`` drops records the same way render_view drops fields: "text"
+    has no section records, "sections" no page records, and "compact"
+    section records carry no content. Only the current page and section
+    are held in memory.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    doc = _import_fitz().open(pdf_path)
+    num_pages = len(doc)
+    serial = workers <= 1 or num_pages < PARALLEL_MIN_PAGES
+    if serial:
+        pages = (_page_text(page, layout) for page in doc)
+    else:
+        doc.close()
+        pages = _iter_pages_parallel(pdf_path, num_pages, workers, layout)
+
+    def section_records(sections: list[dict]):
+        if view == "text":
+            return
+        for section in sections:
+            if view == "compact":
+                del section["content"]
+            yield {"type": "section", **section}
+
+    document = {"type": "document", "title": None, "pdf_path": pdf_path, "pages": num_pages}
+    splitter = _SectionSplitter()
+    section_count = 0
+    try:
+        for page_num, (text, headings) in enumerate(pages, start=1):
+            if page_num == 1:
+                document["title"] = _detect_title(text)
+                yield document
+            start = splitter.offset
+            closed = splitter.feed(page_num, text, headings)
+            if view != "sections":
+                yield {"type": "page", "page": page_num, "start": start, "text": text}
+            section_count += len(closed)
+            yield from section_records(closed)
+    finally:
+        if serial:
+            doc.close()
+
+    if num_pages == 0:
+        yield document
+    closed = splitter.finish()
+    section_count += len(closed)
+    yield from section_records(closed)
+    yield {"type": "end", "pages": num_pages, "sections": section_count}
+
+
+def section_key(title: str) -> str:
+    """
+    Canonical name of a section header or section name.
+
+    "2. Methods", "method" and "METHOD" all give "method": the keyword
+    SECTION_PATTERN recognises, lowercased, without a plural "s".
+    """
+    match = SECTION_PATTERN.match(title.strip())
+    name = match.group(1) if match else title.strip()
+    name = re.sub(r"\s+", " ", name.lower())
+    return name[:-1] if name.endswith("s") else name
+
+
+def _parse_page_spec(spec: str, num_pages: int) -> list[int]:
+    """Parse "1-3,5,10-" into sorted 1-based page numbers."""
+    pages = set()
+    for part in spec.split(","):
+        part = part.strip()
+        match = re.fullmatch(r"(\d+)(?:-(\d*))?", part)
+        if not match:
+            raise ValueError(f"Invalid page range: {part!r}")
+        start = int(match.group(1))
+        if match.group(2) is None:
+            stop = start
+        else:
+            stop = int(match.group(2)) if match.group(2) else num_pages
+        if start < 1 or stop > num_pages or start > stop:
+            raise ValueError(f"Page range {part!r} is outside 1-{num_pages}")
+        pages.update(range(start, stop + 1))
+    return sorted(pages)
+
+
+class LazyPaper:
+    """
+    A PDF whose pages are extracted only when first needed.
+
+        with LazyPaper("paper.pdf") as paper:
+            print(paper.title)
+            intro = paper.section("introduction")  # Reads up to the next header
+
+    Page texts are kept once read, so revisiting a page is free. ``layout``
+    is one of LAYOUTS.
+    """
+
+    def __init__(self, pdf_path: str, layout: str = "plain"):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout}")
+        self.pdf_path = pdf_path
+        self.layout = layout
+        self._doc = None
+        self._pages: dict[int, tuple[str, list[int] | None]] = {}
+
+    @property
+    def doc(self):
+        if self._doc is None:
+            self._doc = _import_fitz().open(self.pdf_path)
+        return self._doc
+
+    @property
+    def num_pages(self) -> int:
+        return len(self.doc)
+
+    def __len__(self) -> int:
+        return self.num_pages
+
+    def _page(self, page_num: int) -> tuple[str, list[int] | None]:
+        if not 1 <= page_num <= self.num_pages:
+            raise IndexError(f"Page {page_num} is outside 1-{self.num_pages}")
+        if page_num not in self._pages:
+            self._pages[page_num] = _page_text(self.doc[page_num - 1], self.layout)
+        return self._pages[page_num]
+
+    def page(self, page_num: int) -> str:
+        """Text of a 1-based page."""
+        return self._page(page_num)[0]
+
+    @property
+    def title(self) -> str | None:
+        return _detect_title(self.page(1)) if self.num_pages else None
+
+    def iter_sections(self, page_numbers: list[int] | None = None):
+        """
+        Yield sections in order, as extract_text would split them.
+
+        Pages are read only as far as the caller keeps iterating. Offsets
+        index the text of the pages read, joined with PAGE_SEPARATOR.
+        """
+        page_numbers = page_numbers or range(1, self.num_pages + 1)
+        splitter = _SectionSplitter(page_numbers[0] if page_numbers else 1)
+        for page_num in page_numbers:
+            yield from splitter.feed(page_num, *self._page(page_num))
+        yield from splitter.finish()
+
+    def section(self, name: str) -> dict | None:
+        """The first section called name (see section_key), or None."""
+        key = section_key(name)
+        for section in self.iter_sections():
+            if section_key(section["title"]) == key:
+                return section
+        return None
+
+    def close(self) -> None:
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def __enter__(self) -> "LazyPaper":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def extract_selected(
+    pdf_path: str,
+    pages: str | None = None,
+    sections: list[str] | None = None,
+    layout: str = "plain",
+) -> dict:
+    """
+    Extract only part of a PDF.
+
+    Args:
+        pages: Page ranges to read, e.g. "1-3,5" or "10-" (default: all)
+        sections: Section names to return, e.g. ["abstract", "introduction"].
+            Reading stops as soon as every requested section has been
+            closed by the header that follows it.
+
+    The result has the same fields as extract_text, plus
+    ``extracted_pages``; ``pages`` is still the document's page count,
+    and ``text`` and the section offsets cover only the pages read.
+    """
+    wanted = set()
+    for name in sections or []:
+        if name.strip().lower() != "beginning" and not SECTION_PATTERN.fullmatch(name.strip()):
+            raise ValueError(f"Unknown section name: {name!r}")
+        wanted.add(section_key(name))
+
+    with LazyPaper(pdf_path, layout) as paper:
+        page_numbers = (
+            _parse_page_spec(pages, paper.num_pages)
+            if pages
+            else list(range(1, paper.num_pages + 1))
+        )
+
+        splitter = _SectionSplitter(page_numbers[0] if page_numbers else 1)
+        found, done = [], set()
+        read = []
+
+        def keep(closed: list[dict]) -> None:
+            for section in closed:
+                key = section_key(section["title"])
+                if not wanted or key in wanted:
+                    found.append(section)
+                    done.add(key)
+
+        for page_num in page_numbers:
+            keep(splitter.feed(page_num, *paper._page(page_num)))
+            read.append(page_num)
+            if wanted and done >= wanted:
+                break
+        else:
+            keep(splitter.finish())
+
+        return {
+            "title": paper.title,
+            "pdf_path": pdf_path,
+            "pages": paper.num_pages,
+            "extracted_pages": read,
+            "text": PAGE_SEPARATOR.join(paper.page(n) for n in read),
+            "sections": found,
+        }
+
+
+# Bump whenever extract_text's output changes so stale cache entries are
+# never served.
+EXTRACTOR_VERSION = 2
+
+# Size bound for the extraction cache; least recently used entries go first.
+EXTRACTION_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _extraction_cache_dir(cache_dir: str) -> str:
+    return os.path.join(cache_dir, "extracted")
+
+
+def _evict_extraction_cache(extract_dir: str, max_bytes: int) -> None:
+    """Delete least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    for entry in os.scandir(extract_dir):
+        if entry.is_file() and entry.name.endswith(".json"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def extract_text_cached(
+    pdf_path: str,
+    cache_dir: str,
+    workers: int | None = None,
+    max_bytes: int = EXTRACTION_CACHE_MAX_BYTES,
+    layout: str = "plain",
+) -> dict:
+    """
+    extract_text with a persistent cache keyed by the PDF's SHA-256.
+
+    Entries are JSON files named ``<sha256>-v<EXTRACTOR_VERSION>.json``
+    (``...-v<EXTRACTOR_VERSION>-<layout>.json`` for layouts other than
+    plain), so the same paper cached under a different name or path still
+    hits. A hit refreshes the entry's mtime, which drives LRU eviction.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
+    extract_dir = _extraction_cache_dir(cache_dir)
+    os.makedirs(extract_dir, exist_ok=True)
+    suffix = "" if layout == "plain" else f"-{layout}"
+    entry_path = os.path.join(
+        extract_dir, f"{file_sha256(pdf_path)}-v{EXTRACTOR_VERSION}{suffix}.json"
+    )
+
+    try:
+        with open(entry_path, encoding="utf-8") as f:
+            result = json.load(f)
+        os.utime(entry_path)
+        result["pdf_path"] = pdf_path
+        return result
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+
+    result = extract_text(pdf_path, workers=workers, layout=layout)
+
+    _write_json_atomic(entry_path, result)
+
+    _evict_extraction_cache(extract_dir, max_bytes)
+    return result
+
+
+def purge_extraction_cache(cache_dir: str) -> int:
+    """Remove every cached extraction. Returns the number of entries removed."""
+    extract_dir = _extraction_cache_dir(cache_dir)
+    if not os.path.isdir(extract_dir):
+        return 0
+
+    removed = 0
+    for entry in os.scandir(extract_dir):
+        if entry.is_file():
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+
+def _print_progress(downloaded: int, total: int | None, rate: float) -> None:
+    """Download progress callback for --progress; writes to stderr."""
+    now = time.monotonic()
+    if total is None or downloaded < total:
+        # At most a few updates per second
+        if now - getattr(_print_progress, "last", 0.0) < 0.5:
+            return
+    _print_progress.last = now
+
+    done = f"{downloaded / 1e6:.1f}"
+    if total:
+        done += f"/{total / 1e6:.1f} MB ({100 * downloaded / total:.0f}%)"
+    else:
+        done += " MB"
+    print(f"Downloaded {done} at {rate / 1e6:.2f} MB/s", file=sys.stderr)
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """Argument parser that reports usage errors as JSON, like other failures."""
+
+    def error(self, message):
+        print(json.dumps({"error": f"{message} ({self.format_usage().strip()})"}))
         sys.exit(1)
 
-    source_type = sys.argv[1].lower()
-    source = sys.argv[2]
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = _ArgumentParser(
+        prog="download_paper.py",
+        description="Download and extract text from academic papers.",
+    )
+    parser.add_argument(
+        "source_type",
+        nargs="?",
+        choices=["arxiv", "local", "url", "arxiv-batch"],
+    )
+    parser.add_argument(
+        "source",
+        nargs="?",
+        help=(
+            "arXiv ID, local PDF path, or PDF URL; for arxiv-batch, a file with "
+            "one ID per line or a comma-separated list of IDs"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Extraction processes (default: one per CPU; 1 = serial)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-extract; neither read nor write the extraction cache",
+    )
+    parser.add_argument(
+        "--purge-cache",
+        action="store_true",
+        help="Delete all cached extractions first (may be used without a source)",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Report download progress and throughput on stderr",
+    )
+    parser.add_argument(
+        "--revalidate",
+        action="store_true",
+        help="Check cached PDFs with a conditional request (ETag / Last-Modified)",
+    )
+    parser.add_argument(
+        "--view",
+        choices=["full", "compact", "text", "sections"],
+        default="full",
+        help=(
+            "Output shape: full (text + section contents), compact (text + "
+            "section offsets into it), text only, or sections only"
+        ),
+    )
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default="plain",
+        help=(
+            "Text extraction: plain (content-stream order) or blocks (column "
+            "order from block positions, headers found by font size/weight)"
+        ),
+    )
+    parser.add_argument(
+        "--pages",
+        help='Only read these 1-based pages, e.g. "1-3,5" or "10-"',
+    )
+    parser.add_argument(
+        "--sections",
+        help=(
+            'Only return these sections, e.g. "abstract,introduction,method"; '
+            "reading stops once they are all complete"
+        ),
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help=(
+            "Stream one JSON record per line (document, page, section, end) "
+            "as pages are extracted; bypasses the extraction cache"
+        ),
+    )
+    parser.add_argument(
+        "--compact-json",
+        action="store_true",
+        help="Print JSON without indentation",
+    )
+    args = parser.parse_args(argv)
+    if args.source is None and not args.purge_cache:
+        parser.error("the following arguments are required: source_type, source")
+    if args.ndjson and args.source_type == "arxiv-batch":
+        parser.error("--ndjson is not supported for arxiv-batch")
+    if args.ndjson and (args.pages or args.sections):
+        parser.error("--pages and --sections cannot be combined with --ndjson")
+    return args
+
+
+def main():
+    args = _parse_args()
+    source_type = args.source_type
+    source = args.source
 
     cache_dir = os.path.join(tempfile.gettempdir(), "paper_cache")
     os.makedirs(cache_dir, exist_ok=True)
 
+    if args.purge_cache:
+        purged = purge_extraction_cache(cache_dir)
+        if source is None:
+            print(json.dumps({"purged": purged}))
+            return
+
+    progress = _print_progress if args.progress else None
+
+    if source_type == "arxiv-batch":
+        try:
+            papers = download_arxiv_batch(_read_id_list(source), cache_dir)
+        except Exception as e:
+            print(json.dumps({"error": str(e)}))
+            sys.exit(1)
+        print(json.dumps({
+            "source": source,
+            "source_type": source_type,
+            "papers": [{"arxiv_id": arxiv_id, **paper} for arxiv_id, paper in papers.items()],
+        }, indent=2))
+        return
+
     try:
         if source_type == "arxiv":
-            pdf_path = download_arxiv(source, cache_dir)
+            pdf_path = download_arxiv(
+                source,
+                cache_dir,
+                revalidate=args.revalidate,
+                progress=progress,
+            )
         elif source_type == "local":
             if not os.path.exists(source):
                 raise ValueError(f"File not found: {source}")
             pdf_path = source
         elif source_type == "url":
-            pdf_path = download_url(source, cache_dir)
+            pdf_path = download_url(
+                source,
+                cache_dir,
+                progress=progress,
+                revalidate=args.revalidate,
+            )
         else:
             raise ValueError(f"Unknown source type: {source_type}")
 
-        result = extract_text(pdf_path)
+        if args.ndjson:
+            records = iter_extraction(
+                pdf_path, workers=args.workers, view=args.view, layout=args.layout
+            )
+            for record in records:
+                if record["type"] == "document":
+                    record.update(source=source, source_type=source_type)
+                print(json.dumps(record, separators=(",", ":")), flush=True)
+            return
+
+        if args.pages or args.sections:
+            # Partial reads are quick and never cached
+            result = extract_selected(
+                pdf_path,
+                pages=args.pages,
+                sections=args.sections.split(",") if args.sections else None,
+                layout=args.layout,
+            )
+        elif args.no_cache:
+            result = extract_text(pdf_path, workers=args.workers, layout=args.layout)
+        else:
+            result = extract_text_cached(
+                pdf_path, cache_dir, workers=args.workers, layout=args.layout
+            )
         result["source"] = source
         result["source_type"] = source_type
 
-        print(json.dumps(result, indent=2))
+        result = render_view(result, args.view)
+        if args.compact_json:
+            print(json.dumps(result, separators=(",", ":")))
+        else:
+            print(json.dumps(result, indent=2))
 
     except Exception as e:
         print(json.dumps({"error": str(e)}))
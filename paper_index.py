@@ -0,0 +1,114 @@
+"""Paper index - local BM25 retrieval over extracted paper sections."""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Target chunk size in words; chunks break on line boundaries.
+CHUNK_WORDS = 150
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass
+class Chunk:
+    """A contiguous piece of one section."""
+    section: str
+    text: str
+    position: int  # Order of the chunk within the paper
+
+
+def chunk_sections(sections: list[dict], chunk_words: int = CHUNK_WORDS) -> list[Chunk]:
+    """Split each section's content into chunks of roughly chunk_words words."""
+    chunks = []
+    for section in sections:
+        lines, words = [], 0
+        for line in section["content"].split("\n"):
+            lines.append(line)
+            words += len(line.split())
+            if words >= chunk_words:
+                chunks.append(Chunk(section["title"], "\n".join(lines), len(chunks)))
+                lines, words = [], 0
+        if lines:
+            chunks.append(Chunk(section["title"], "\n".join(lines), len(chunks)))
+    return chunks
+
+
+class PaperIndex:
+    """
+    BM25 index over the chunks of one paper.
+
+    Everything is computed locally from the extractor output, so building
+    and querying an index needs no network access. Section titles are
+    indexed along with chunk text, so a query like "method" favours chunks
+    from the method section.
+    """
+
+    def __init__(self, chunks: list[Chunk], title: str | None = None, k1: float = 1.5, b: float = 0.75):
+        self.title = title
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._lengths: list[int] = []
+        for chunk_id, chunk in enumerate(chunks):
+            tokens = tokenize(chunk.section) + tokenize(chunk.text)
+            self._lengths.append(len(tokens))
+            for token, count in Counter(tokens).items():
+                self._postings.setdefault(token, []).append((chunk_id, count))
+
+        self._avg_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        n = len(chunks)
+        self._idf = {
+            token: math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for token, postings in self._postings.items()
+        }
+
+    @classmethod
+    def from_extraction(cls, paper: dict, chunk_words: int = CHUNK_WORDS) -> "PaperIndex":
+        """
+        Build an index from download_paper.py output.
+
+        Sections without content (the compact view) are sliced out of the
+        paper text using their offsets.
+        """
+        sections = []
+        for section in paper.get("sections", []):
+            if "content" not in section:
+                raw = paper.get("text", "")[section["start"]:section["end"]]
+                lines = [line.strip() for line in raw.split("\n") if line.strip()]
+                if lines and lines[0] == section["title"]:
+                    lines = lines[1:]  # Header line
+                section = {**section, "content": "\n".join(lines)}
+            sections.append(section)
+        return cls(chunk_sections(sections, chunk_words), title=paper.get("title"))
+
+    def search(self, query: str, k: int = 5) -> list[tuple[Chunk, float]]:
+        """Return the top-k chunks for a query, best first."""
+        scores: dict[int, float] = {}
+        for token in set(tokenize(query)):
+            idf = self._idf.get(token)
+            if idf is None:
+                continue
+            for chunk_id, tf in self._postings[token]:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[chunk_id] / self._avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.chunks[chunk_id], score) for chunk_id, score in ranked]
+
+    def outline(self) -> list[dict]:
+        """Section titles in order with their size in words."""
+        outline: list[dict] = []
+        for chunk in self.chunks:
+            if not outline or outline[-1]["title"] != chunk.section:
+                outline.append({"title": chunk.section, "words": 0})
+            outline[-1]["words"] += len(chunk.text.split())
+        return outline
@@ -0,0 +1,189 @@
+"""Script runner - executes skill scripts in warm, long-lived worker processes."""
+
+import io
+import json
+import os
+import queue
+import runpy
+import subprocess
+import sys
+import threading
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+
+class _Worker:
+    """One persistent Python process running scripts on request."""
+
+    def __init__(self, python: str):
+        self.process = subprocess.Popen(
+            [python, "-u", str(Path(__file__).resolve())],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+        )
+        self._responses: queue.Queue = queue.Queue()
+        threading.Thread(target=self._read_responses, daemon=True).start()
+
+    def _read_responses(self) -> None:
+        for line in self.process.stdout:
+            self._responses.put(line)
+        self._responses.put(None)  # Worker exited
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def request(self, payload: dict, timeout: float) -> dict:
+        self.process.stdin.write(json.dumps(payload) + "\n")
+        self.process.stdin.flush()
+
+        line = self._responses.get(timeout=timeout)
+        if line is None:
+            raise RuntimeError("Script worker exited unexpectedly")
+        return json.loads(line)
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.wait()
+
+
+class ScriptRunner:
+    """
+    Runs skill scripts without paying interpreter start-up on every call.
+
+    Each script runs inside a persistent worker process via ``runpy``: the
+    script body executes afresh in its own ``__main__`` namespace with the
+    requested argv and cwd, but modules it imports (fitz, requests, arxiv,
+    ...) stay loaded between calls. Workers speak JSON lines over their
+    stdin/stdout pipes.
+
+    Concurrent calls each get their own worker; idle workers are reused.
+    A call that exceeds its timeout kills its worker, which is replaced on
+    the next call.
+    """
+
+    def __init__(self, python: str = sys.executable):
+        self.python = python
+        self._idle: list[_Worker] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> _Worker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive():
+                    return worker
+        return _Worker(self.python)
+
+    def _release(self, worker: _Worker) -> None:
+        with self._lock:
+            self._idle.append(worker)
+
+    def run(
+        self,
+        script_path: str | Path,
+        args: list[str],
+        timeout: float = 120,
+        cwd: str | None = None,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a script and capture its output, like ``subprocess.run``.
+
+        Raises subprocess.TimeoutExpired if the script runs past ``timeout``.
+        """
+        command = [str(script_path)] + list(args)
+        worker = self._acquire()
+
+        try:
+            response = worker.request(
+                {"argv": command, "cwd": cwd or os.getcwd()},
+                timeout=timeout,
+            )
+        except queue.Empty:
+            worker.kill()
+            raise subprocess.TimeoutExpired(command, timeout)
+        except Exception:
+            worker.kill()
+            raise
+
+        self._release(worker)
+        return subprocess.CompletedProcess(
+            command,
+            response["returncode"],
+            response["stdout"],
+            response["stderr"],
+        )
+
+    def close(self) -> None:
+        """Stop all idle workers."""
+        with self._lock:
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.process.stdin.close()
+            worker.process.wait()
+
+    def __enter__(self) -> "ScriptRunner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _run_request(request: dict) -> dict:
+    """Run one script in this process, capturing output and exit status."""
+    argv = request["argv"]
+    script_path = argv[0]
+
+    saved_argv, saved_path, saved_cwd = sys.argv, sys.path[:], os.getcwd()
+    stdout, stderr = io.StringIO(), io.StringIO()
+    returncode = 0
+
+    try:
+        os.chdir(request["cwd"])
+        sys.argv = list(argv)
+        # Same import path as `python script.py`
+        sys.path.insert(0, os.path.dirname(os.path.abspath(script_path)))
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            runpy.run_path(script_path, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            returncode = 0
+        elif isinstance(e.code, int):
+            returncode = e.code
+        else:
+            stderr.write(f"{e.code}\n")
+            returncode = 1
+    except BaseException:
+        stderr.write(traceback.format_exc())
+        returncode = 1
+    finally:
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        os.chdir(saved_cwd)
+
+    return {
+        "returncode": returncode,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+    }
+
+
+def _serve() -> None:
+    """Worker loop: read JSON requests from stdin, answer on stdout."""
+    # Keep the protocol on a private copy of stdout and point fd 1 at
+    # stderr, so stray writes from C extensions can't corrupt responses.
+    protocol = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        response = _run_request(json.loads(line))
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    _serve()
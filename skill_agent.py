@@ -1,17 +1,81 @@
 """Agent that uses markdown-based skills (Claude-style)."""
 
 import os
+import argparse
+import contextlib
+import hashlib
+import re
 import subprocess
 import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from openai import OpenAI
-from dotenv import load_dotenv
+from skill_loader import SkillChanges, SkillLoader, Skill
+from script_runner import ScriptRunner
+from paper_index import PaperIndex
+from token_budget import CompactionStats, TokenBudget
+from completion_cache import CompletionCache
 
-from skill_loader import SkillLoader, Skill
+# openai and dotenv are imported where they are first needed: importing
+# openai alone takes most of a second, which `--help` and argument errors
+# should not pay for.
+if TYPE_CHECKING:
+    from openai.types.chat import ChatCompletion
 
-load_dotenv()
+
+SUMMARY_PROMPT = "Now provide a detailed summary of this paper, including key takeaways."
+
+ANALYZE_PROMPT = """Analyze this paper in detail:
+1. What is the core methodology?
+2. What are the key contributions?
+3. What are the strengths of this work?
+4. What are the weaknesses and limitations?
+5. What technical details are important for understanding the approach?"""
+
+EXPLAIN_PROMPT = """Now explain this paper in simple, accessible language for someone who is NOT an expert.
+
+Use everyday analogies, avoid jargon, and focus on:
+- Why should anyone care about this?
+- What problem does it solve in simple terms?
+- How does the solution work (using analogies)?
+- What's the real-world impact?
+
+Make it engaging and easy to understand for a general audience."""
+
+REPRODUCE_PROMPT = """Based on your analysis of this paper, determine if code reproduction is applicable.
+
+If the paper proposes a novel method, algorithm, model architecture, or technique that can be implemented:
+- Generate Python/PyTorch pseudo-code to reproduce the main method
+- Include: model architecture, training loop, key hyperparameters, important implementation details
+
+If the paper is a survey, position paper, empirical study, dataset paper, or does NOT propose a reproducible method:
+- Explain why reproduction is not applicable
+- Instead, summarize what kind of code/tools the paper discusses or evaluates (if any)
+
+Be explicit about your decision and reasoning."""
+
+# Read-step prompt; search_paper's default paper is the one named in it
+READ_PROMPT = "Read the paper: {source}"
+READ_PAPER_PATTERN = re.compile(r"read the paper:?\s*(\S.*?)\s*$", re.IGNORECASE)
+
+# Steps 2-5, in order: (result key, progress message, prompt)
+ANALYSIS_STEPS = [
+    ("summary", "Generating summary...", SUMMARY_PROMPT),
+    ("analysis", "Analyzing methodology, strengths, and weaknesses...", ANALYZE_PROMPT),
+    ("explanation", "Creating simple explanation for non-experts...", EXPLAIN_PROMPT),
+    ("reproduction", "Checking if reproduction is applicable...", REPRODUCE_PROMPT),
+]
+
+
+def _safe_name(paper_source: str) -> str:
+    """Turn a paper source into a short filesystem-safe name."""
+    safe_name = "".join(c if c.isalnum() or c in ".-_" else "_" for c in paper_source)
+    return safe_name[:50]  # Limit length
 
 
 class PaperAnalysisPipeline:
@@ -24,146 +88,236 @@ class PaperAnalysisPipeline:
     3. Analyze (methodology, strengths, weaknesses)
     4. Explain (simple explanation for non-experts)
     5. Reproduce (generate pseudo-code if applicable)
+
+    By default each step sees every earlier step's answer. In concurrent
+    mode, steps 2-5 fan out in parallel once the paper is read, each
+    starting from the read step's context plus the answers of any steps
+    named in ``depends_on``.
     """
 
     def __init__(self, agent: "SkillAgent", output_dir: str = "paper_reports"):
         self.agent = agent
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.state_dir = self.output_dir / ".state"
+        self._state_lock = threading.Lock()
 
-    def run(self, paper_source: str, verbose: bool = True) -> dict:
+    def run(
+        self,
+        paper_source: str,
+        verbose: bool = True,
+        concurrent: bool = False,
+        depends_on: dict[str, list[str]] | None = None,
+        resume: bool = False,
+    ) -> dict:
         """
         Run the full analysis pipeline on a paper.
 
+        Every step's answer is checkpointed to a per-paper state file in
+        ``<output_dir>/.state/`` as soon as it completes. When verbose and
+        not concurrent, answers are streamed to the terminal as they are
+        generated.
+
         Args:
             paper_source: arXiv ID, PDF path, or URL
             verbose: Print progress updates
+            concurrent: Run steps 2-5 in parallel after the read step
+            depends_on: In concurrent mode, extra context per step, e.g.
+                {"reproduction": ["analysis"]} makes reproduction wait for
+                and see the analysis answer. Dependencies must name
+                earlier steps.
+            resume: Reuse checkpointed steps from an earlier run of the
+                same paper and only run the missing ones
 
         Returns:
             Dict with all analysis results
         """
-        results = {
-            "source": paper_source,
-            "timestamp": datetime.now().isoformat(),
-            "steps": {},
-        }
-
+        if concurrent:
+            self._check_dependencies(depends_on or {})
+
+        state_path = self._state_path(paper_source)
+        results = self._load_state(state_path) if resume else None
+
+        if results and results.get("report_path") and Path(results["report_path"]).exists():
+            if verbose:
+                print(f"Already analyzed; report: {results['report_path']}")
+            return results
+
+        if not results:
+            results = {
+                "source": paper_source,
+                "timestamp": datetime.now().isoformat(),
+                "steps": {},
+            }
+            self._checkpoint(state_path, results)
+        elif verbose:
+            print(f"Resuming with completed steps: {', '.join(results['steps'])}")
+
+        on_token = print_token if verbose and not concurrent else None
         conversation_history = []
+        conversation_state = {}  # Carries the active skill from step to step
 
         # Step 1: Read the paper
-        if verbose:
-            print("\n" + "=" * 60)
-            print("Step 1/5: Reading paper...")
-            print("=" * 60)
+        read_prompt = READ_PROMPT.format(source=paper_source)
+        read_response = results["steps"].get("read")
+        if read_response is None:
+            if verbose:
+                self._print_header(1, "Reading paper...")
+
+            if on_token:
+                print()
+            read_response = self.agent.run(
+                read_prompt, conversation_history, on_token=on_token,
+                conversation_state=conversation_state,
+            )
+            self._record_step(state_path, results, "read", read_response)
+
+            if on_token:
+                print()
+            elif verbose:
+                print(f"\n{read_response[:500]}..." if len(read_response) > 500 else f"\n{read_response}")
 
-        read_prompt = f"Read the paper: {paper_source}"
-        read_response = self.agent.run(read_prompt, conversation_history)
-        results["steps"]["read"] = read_response
         conversation_history.append({"role": "user", "content": read_prompt})
         conversation_history.append({"role": "assistant", "content": read_response})
 
-        if verbose:
-            print(f"\n{read_response[:500]}..." if len(read_response) > 500 else f"\n{read_response}")
-
-        # Step 2: Summarize
-        if verbose:
-            print("\n" + "=" * 60)
-            print("Step 2/5: Generating summary...")
-            print("=" * 60)
-
-        summary_prompt = "Now provide a detailed summary of this paper, including key takeaways."
-        summary_response = self.agent.run(summary_prompt, conversation_history)
-        results["steps"]["summary"] = summary_response
-        conversation_history.append({"role": "user", "content": summary_prompt})
-        conversation_history.append({"role": "assistant", "content": summary_response})
-
-        if verbose:
-            print(f"\n{summary_response}")
-
-        # Step 3: Analyze
-        if verbose:
-            print("\n" + "=" * 60)
-            print("Step 3/5: Analyzing methodology, strengths, and weaknesses...")
-            print("=" * 60)
-
-        analyze_prompt = """Analyze this paper in detail:
-1. What is the core methodology?
-2. What are the key contributions?
-3. What are the strengths of this work?
-4. What are the weaknesses and limitations?
-5. What technical details are important for understanding the approach?"""
-        analyze_response = self.agent.run(analyze_prompt, conversation_history)
-        results["steps"]["analysis"] = analyze_response
-        conversation_history.append({"role": "user", "content": analyze_prompt})
-        conversation_history.append({"role": "assistant", "content": analyze_response})
+        # Steps 2-5
+        if concurrent:
+            self._run_concurrent(
+                results, state_path, conversation_history, conversation_state,
+                depends_on or {}, verbose,
+            )
+        else:
+            for step_num, (key, message, prompt) in enumerate(ANALYSIS_STEPS, start=2):
+                response = results["steps"].get(key)
+                if response is None:
+                    if verbose:
+                        self._print_header(step_num, message)
+
+                    if on_token:
+                        print()
+                    response = self.agent.run(
+                        prompt, conversation_history, on_token=on_token,
+                        conversation_state=conversation_state,
+                    )
+                    self._record_step(state_path, results, key, response)
+
+                    if on_token:
+                        print()
+
+                conversation_history.append({"role": "user", "content": prompt})
+                conversation_history.append({"role": "assistant", "content": response})
 
-        if verbose:
-            print(f"\n{analyze_response}")
+        # Save report
+        report_path = self._save_report(results, paper_source)
+        results["report_path"] = str(report_path)
+        self._checkpoint(state_path, results)
 
-        # Step 4: Explain for non-experts
         if verbose:
             print("\n" + "=" * 60)
-            print("Step 4/5: Creating simple explanation for non-experts...")
+            print(f"Pipeline complete! Report saved to: {report_path}")
             print("=" * 60)
 
-        explain_prompt = """Now explain this paper in simple, accessible language for someone who is NOT an expert.
-
-Use everyday analogies, avoid jargon, and focus on:
-- Why should anyone care about this?
-- What problem does it solve in simple terms?
-- How does the solution work (using analogies)?
-- What's the real-world impact?
-
-Make it engaging and easy to understand for a general audience."""
-        explain_response = self.agent.run(explain_prompt, conversation_history)
-        results["steps"]["explanation"] = explain_response
-        conversation_history.append({"role": "user", "content": explain_prompt})
-        conversation_history.append({"role": "assistant", "content": explain_response})
-
-        if verbose:
-            print(f"\n{explain_response}")
+        return results
 
-        # Step 5: Reproduce (only if applicable)
-        if verbose:
+    def _run_concurrent(
+        self,
+        results: dict,
+        state_path: Path,
+        base_history: list[dict],
+        base_state: dict,
+        depends_on: dict[str, list[str]],
+        verbose: bool,
+    ) -> None:
+        """Run the unfinished steps 2-5 in parallel from the read step's context."""
+        prompts = {key: prompt for key, _, prompt in ANALYSIS_STEPS}
+
+        def run_step(key: str, dep_futures: dict[str, Future]) -> str:
+            history = list(base_history)
+            for dep, future in dep_futures.items():
+                history.append({"role": "user", "content": prompts[dep]})
+                history.append({"role": "assistant", "content": future.result()})
+            # Each step continues from the read step's skill on its own copy
+            response = self.agent.run(prompts[key], history, conversation_state=dict(base_state))
+            self._record_step(state_path, results, key, response)
+            return response
+
+        pending = [key for key in prompts if key not in results["steps"]]
+        if verbose and pending:
             print("\n" + "=" * 60)
-            print("Step 5/5: Checking if reproduction is applicable...")
+            print(f"Steps 2-{len(ANALYSIS_STEPS) + 1}/{len(ANALYSIS_STEPS) + 1}: "
+                  f"Running {len(pending)} concurrently...")
             print("=" * 60)
 
-        reproduce_prompt = """Based on your analysis of this paper, determine if code reproduction is applicable.
-
-If the paper proposes a novel method, algorithm, model architecture, or technique that can be implemented:
-- Generate Python/PyTorch pseudo-code to reproduce the main method
-- Include: model architecture, training loop, key hyperparameters, important implementation details
-
-If the paper is a survey, position paper, empirical study, dataset paper, or does NOT propose a reproducible method:
-- Explain why reproduction is not applicable
-- Instead, summarize what kind of code/tools the paper discusses or evaluates (if any)
-
-Be explicit about your decision and reasoning."""
-        reproduce_response = self.agent.run(reproduce_prompt, conversation_history)
-        results["steps"]["reproduction"] = reproduce_response
-        conversation_history.append({"role": "user", "content": reproduce_prompt})
-        conversation_history.append({"role": "assistant", "content": reproduce_response})
-
-        if verbose:
-            print(f"\n{reproduce_response}")
-
-        # Save report
-        report_path = self._save_report(results, paper_source)
-        results["report_path"] = str(report_path)
+        # Checkpointed steps become already-completed futures, so dependants
+        # read them the same way as freshly computed answers.
+        futures: dict[str, Future] = {}
+        for key in prompts:
+            if key in results["steps"]:
+                futures[key] = Future()
+                futures[key].set_result(results["steps"][key])
+
+        # One thread per step, so a step waiting on a dependency can never
+        # starve the step it waits for.
+        with ThreadPoolExecutor(max_workers=len(ANALYSIS_STEPS)) as pool:
+            for key in pending:
+                dep_futures = {dep: futures[dep] for dep in depends_on.get(key, [])}
+                futures[key] = pool.submit(run_step, key, dep_futures)
+
+        for step_num, (key, message, _) in enumerate(ANALYSIS_STEPS, start=2):
+            futures[key].result()
+            if verbose and key in pending:
+                self._print_header(step_num, message)
+                print(f"\n{results['steps'][key]}")
+
+        # Keep steps in pipeline order regardless of completion order
+        results["steps"] = {
+            key: results["steps"][key]
+            for key in ["read", *prompts]
+        }
 
-        if verbose:
-            print("\n" + "=" * 60)
-            print(f"Pipeline complete! Report saved to: {report_path}")
-            print("=" * 60)
+    def _state_path(self, paper_source: str) -> Path:
+        """Per-paper checkpoint file; the digest keeps truncated names unique."""
+        digest = hashlib.sha256(paper_source.encode("utf-8")).hexdigest()[:12]
+        return self.state_dir / f"{_safe_name(paper_source)}_{digest}.json"
 
-        return results
+    @staticmethod
+    def _load_state(state_path: Path) -> dict | None:
+        try:
+            return json.loads(state_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _record_step(self, state_path: Path, results: dict, key: str, response: str) -> None:
+        """Store a finished step's answer and checkpoint it immediately."""
+        with self._state_lock:
+            results["steps"][key] = response
+            self._checkpoint(state_path, results)
+
+    def _checkpoint(self, state_path: Path, results: dict) -> None:
+        """Write the state file atomically so a crash never leaves it truncated."""
+        self.state_dir.mkdir(exist_ok=True)
+        tmp_path = state_path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        os.replace(tmp_path, state_path)
+
+    @staticmethod
+    def _check_dependencies(depends_on: dict[str, list[str]]) -> None:
+        """Reject unknown steps and dependencies on the same or later steps."""
+        order = [key for key, _, _ in ANALYSIS_STEPS]
+        for key, deps in depends_on.items():
+            for dep in deps:
+                if key not in order or dep not in order or order.index(dep) >= order.index(key):
+                    raise ValueError(f"Invalid step dependency: {key} -> {dep}")
+
+    def _print_header(self, step_num: int, message: str) -> None:
+        print("\n" + "=" * 60)
+        print(f"Step {step_num}/{len(ANALYSIS_STEPS) + 1}: {message}")
+        print("=" * 60)
 
     def _save_report(self, results: dict, paper_source: str) -> Path:
         """Save the analysis report to a markdown file."""
         # Create filename from source
-        safe_name = "".join(c if c.isalnum() or c in ".-_" else "_" for c in paper_source)
-        safe_name = safe_name[:50]  # Limit length
+        safe_name = _safe_name(paper_source)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"report_{safe_name}_{timestamp}.md"
         filepath = self.output_dir / filename
@@ -214,6 +368,84 @@ Be explicit about your decision and reasoning."""
         return filepath
 
 
+@dataclass(frozen=True)
+class _SkillState:
+    """Loaded skills with the system prompt and tools rendered from them."""
+    skills: dict[str, Skill]
+    system_prompt: str  # Without any active skill
+    tools: list[dict]
+
+
+class StreamAccumulator:
+    """Rebuilds a full ChatCompletion from streamed chunks."""
+
+    def __init__(self):
+        self.meta = {"id": "", "created": 0, "model": ""}
+        self.content: list[str] = []
+        self.tool_calls: dict[int, dict] = {}
+        self.finish_reason = "stop"
+        self.usage = None
+
+    def add(self, chunk) -> str | None:
+        """Absorb one chunk; return its text delta, if any."""
+        self.meta = {"id": chunk.id, "created": chunk.created, "model": chunk.model}
+        if getattr(chunk, "usage", None):
+            self.usage = chunk.usage.model_dump()
+        if not chunk.choices:
+            return None
+
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+
+        delta = choice.delta
+        for tool_call in delta.tool_calls or []:
+            entry = self.tool_calls.setdefault(tool_call.index, {
+                "id": "",
+                "type": "function",
+                "function": {"name": "", "arguments": ""},
+            })
+            if tool_call.id:
+                entry["id"] = tool_call.id
+            if tool_call.function:
+                entry["function"]["name"] += tool_call.function.name or ""
+                entry["function"]["arguments"] += tool_call.function.arguments or ""
+
+        if delta.content:
+            self.content.append(delta.content)
+            return delta.content
+        return None
+
+    def result(self) -> "ChatCompletion":
+        from openai.types.chat import ChatCompletion
+
+        message = {
+            "role": "assistant",
+            "content": "".join(self.content) or None,
+        }
+        if self.tool_calls:
+            message["tool_calls"] = [self.tool_calls[i] for i in sorted(self.tool_calls)]
+
+        return ChatCompletion.model_validate({
+            **self.meta,
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": message, "finish_reason": self.finish_reason}],
+            "usage": self.usage,
+        })
+
+
+def print_token(text: str) -> None:
+    """on_token callback that writes streamed text straight to the terminal."""
+    print(text, end="", flush=True)
+
+
+# Seconds a skill script may run before it is killed
+SCRIPT_TIMEOUT = 120
+
+# Completion rounds per user turn before giving up on tool calls
+MAX_TOOL_ITERATIONS = 10
+
+
 class SkillAgent:
     """
     An agent that uses markdown-based skills.
@@ -229,22 +461,126 @@ class SkillAgent:
         self,
         skills_dir: str = "claude_skills",
         model: str = "gpt-4o-mini",
+        warm_scripts: bool = True,
+        max_concurrent_requests: int | None = None,
+        retrieval: bool = False,
+        token_budget: int | None = None,
+        max_tool_workers: int = 4,
+        completion_cache: CompletionCache | None = None,
+        watch_skills: bool = False,
     ):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        """
+        Args:
+            skills_dir: Directory holding one folder per skill
+            model: Chat completions model
+            warm_scripts: Run skill scripts in persistent worker processes,
+                skipping interpreter start-up and heavy imports on repeated
+                calls; False spawns a fresh interpreter per call
+            max_concurrent_requests: Cap on in-flight chat completions across
+                all threads sharing this agent (e.g. a batch of pipelines)
+            retrieval: Index paper text returned by skill scripts locally and
+                give the LLM only the title and section outline; it pulls
+                passages with the search_paper tool
+            token_budget: Cap on the estimated prompt tokens of every
+                completion; old tool results are truncated and stale turns
+                dropped first (see token_budget.TokenBudget)
+            max_tool_workers: Threads for running one turn's tool calls
+                concurrently; every call's duration goes to tool_timings
+            completion_cache: CompletionCache answering repeated identical
+                requests (model, messages, tools, parameters) from disk
+            watch_skills: Start every run() with refresh_skills(), picking up
+                edited SKILL.md files
+        """
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        self.client = self._create_client()
         self.model = model
         self.skills_dir = skills_dir
-
-        # Load skills
+        self.script_runner = ScriptRunner() if warm_scripts else None
+        self._request_slots = (
+            threading.BoundedSemaphore(max_concurrent_requests)
+            if max_concurrent_requests
+            else None
+        )
+
+        # Load skills; the system prompt and tools depend on them, so all
+        # three are cached together and replaced as one on refresh.
+        self.retrieval = retrieval
+        self.watch_skills = watch_skills
         self.skill_loader = SkillLoader(skills_dir)
-        self.skills = self.skill_loader.load_all()
+        self._skill_state = self._snapshot_skills(self.skill_loader.load_all())
+        self._refresh_lock = threading.Lock()
+
+        # Indexed papers by source and PDF path, shared by all conversations
+        self.papers: dict[str, PaperIndex] = {}
+
+        self.token_budget = TokenBudget(token_budget, model=model) if token_budget else None
+        self.last_compaction: CompactionStats | None = None
 
-        # Track currently active skill (selected by LLM)
-        self.active_skill: Skill | None = None
+        self.max_tool_workers = max_tool_workers
+        self.completion_cache = completion_cache
+        self.tool_timings: list[dict] = []
+        self._timings_lock = threading.Lock()
 
         print(f"Loaded {len(self.skills)} skills: {list(self.skills.keys())}")
 
-    def _build_system_prompt(self, active_skill: Skill | None = None) -> str:
-        """Build the system prompt, optionally including an active skill."""
+    def _create_client(self):
+        from openai import OpenAI
+
+        return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+    @property
+    def skills(self) -> dict[str, Skill]:
+        return self._skill_state.skills
+
+    def _snapshot_skills(self, skills: dict[str, Skill]) -> "_SkillState":
+        return _SkillState(
+            skills=skills,
+            system_prompt=self._render_system_prompt(skills),
+            tools=self._render_tools(skills),
+        )
+
+    def refresh_skills(self) -> SkillChanges:
+        """
+        Reload edited skills; returns what changed.
+
+        Only SKILL.md files whose mtime or size changed are re-parsed. The
+        skills, system prompt and tools are swapped in as one snapshot,
+        which each run() reads once.
+        """
+        with self._refresh_lock:
+            changes = self.skill_loader.refresh()
+            if not changes:
+                return changes
+
+            self._skill_state = self._snapshot_skills(self.skill_loader.skills)
+
+        for label, names in (("added", changes.added), ("updated", changes.updated),
+                             ("removed", changes.removed)):
+            if names:
+                print(f"[skills] {label}: {', '.join(names)}")
+        return changes
+
+    def _build_system_prompt(self, state: "_SkillState", active_skill: Skill | None = None) -> str:
+        """Build the system prompt from a skill snapshot, optionally with an active skill."""
+        base_prompt = state.system_prompt
+
+        # If a skill is active, include its full instructions
+        if active_skill:
+            base_prompt += f"""
+
+---
+## Active Skill: {active_skill.name}
+
+{active_skill.instructions}
+---
+"""
+
+        return base_prompt
+
+    def _render_system_prompt(self, skills: dict[str, Skill]) -> str:
+        """Build the part of the system prompt that depends only on the skills."""
         base_prompt = """You are a helpful research assistant specialized in academic papers.
 
 ## Available Skills
@@ -252,7 +588,7 @@ class SkillAgent:
 You have access to the following skills. Use the `use_skill` tool to activate a skill when appropriate:
 """
         # Add skill descriptions
-        for skill in self.skills.values():
+        for skill in skills.values():
             base_prompt += f"\n- **{skill.name}**: {skill.description}"
 
         base_prompt += """
@@ -269,26 +605,22 @@ You have access to the following skills. Use the `use_skill` tool to activate a
 - `run_script`: Execute a Python script from a skill's scripts directory
 - `read_file`: Read a file from disk
 """
+        if self.retrieval:
+            base_prompt += """- `search_paper`: Retrieve the passages of a read paper most relevant to a query
 
-        # If a skill is active, include its full instructions
-        if active_skill:
-            base_prompt += f"""
-
----
-## Active Skill: {active_skill.name}
-
-{active_skill.instructions}
----
+Paper text is not returned in full when you read a paper; it is indexed instead.
+Call `search_paper` with focused queries (e.g. "training objective", "limitations")
+to fetch the passages you need before answering.
 """
 
         return base_prompt
 
-    def _get_tools(self) -> list[dict]:
+    def _render_tools(self, skills: dict[str, Skill]) -> list[dict]:
         """Define tools the agent can use."""
         # Build skill names for the enum
-        skill_names = list(self.skills.keys())
+        skill_names = list(skills.keys())
 
-        return [
+        tools = [
             {
                 "type": "function",
                 "function": {
@@ -360,8 +692,48 @@ You have access to the following skills. Use the `use_skill` tool to activate a
             },
         ]
 
-    def _execute_tool(self, tool_name: str, arguments: dict) -> str:
-        """Execute a tool and return the result."""
+        if self.retrieval:
+            tools.append({
+                "type": "function",
+                "function": {
+                    "name": "search_paper",
+                    "description": (
+                        "Search the text of a paper that has been read and return "
+                        "the most relevant passages with their section names"
+                    ),
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "query": {
+                                "type": "string",
+                                "description": "What to look for, e.g. 'evaluation datasets'",
+                            },
+                            "top_k": {
+                                "type": "integer",
+                                "description": "Number of passages to return (default 5)",
+                            },
+                            "paper": {
+                                "type": "string",
+                                "description": (
+                                    "Source of the paper as it was read (arXiv ID, path or URL); "
+                                    "defaults to the paper read in this conversation"
+                                ),
+                            },
+                        },
+                        "required": ["query"],
+                    },
+                },
+            })
+
+        return tools
+
+    def _execute_tool(
+        self,
+        tool_name: str,
+        arguments: dict,
+        messages: list[dict] | None = None,
+    ) -> str:
+        """Execute a tool and return the result; messages is the conversation so far."""
         if tool_name == "use_skill":
             return self._use_skill(
                 arguments["skill_name"],
@@ -375,6 +747,13 @@ You have access to the following skills. Use the `use_skill` tool to activate a
             )
         elif tool_name == "read_file":
             return self._read_file(arguments["path"])
+        elif tool_name == "search_paper" and self.retrieval:
+            return self._search_paper(
+                arguments["query"],
+                arguments.get("top_k", 5),
+                arguments.get("paper"),
+                messages,
+            )
         else:
             return json.dumps({"error": f"Unknown tool: {tool_name}"})
 
@@ -384,8 +763,6 @@ You have access to the following skills. Use the `use_skill` tool to activate a
         if not skill:
             return json.dumps({"error": f"Skill not found: {skill_name}"})
 
-        self.active_skill = skill
-
         # Return the skill instructions
         result = {
             "skill_activated": skill_name,
@@ -400,38 +777,196 @@ You have access to the following skills. Use the `use_skill` tool to activate a
 
         return json.dumps(result, indent=2, default=str)
 
-    def _run_script(self, skill_name: str, script_name: str, args: list) -> str:
-        """Run a script from a skill's scripts directory."""
+    def _timed_tool_call(self, tool_call, messages: list[dict] | None = None) -> str:
+        """Execute one tool call and record how long it took."""
+        started = time.perf_counter()
+        result = self._execute_tool(
+            tool_call.function.name,
+            json.loads(tool_call.function.arguments),
+            messages,
+        )
+        self._record_tool_timing(tool_call.function.name, time.perf_counter() - started)
+        return result
+
+    def _record_tool_timing(self, tool_name: str, seconds: float) -> None:
+        with self._timings_lock:
+            self.tool_timings.append({"tool": tool_name, "seconds": round(seconds, 4)})
+
+    def _execute_tool_calls(self, tool_calls, messages: list[dict] | None = None) -> list[str]:
+        """
+        Execute the tool calls of one assistant turn of the conversation
+        in messages.
+
+        Several calls run concurrently on up to max_tool_workers threads;
+        results are returned in the original call order.
+        """
+        if len(tool_calls) == 1 or self.max_tool_workers <= 1:
+            return [self._timed_tool_call(tool_call, messages) for tool_call in tool_calls]
+
+        workers = min(len(tool_calls), self.max_tool_workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self._timed_tool_call, tool_calls, [messages] * len(tool_calls)))
+
+    def _resolve_script(self, skill_name: str, script_name: str) -> tuple[Path | None, str | None]:
+        """Return (script path, None), or (None, JSON error) if it doesn't exist."""
         skill = self.skills.get(skill_name)
         if not skill:
-            return json.dumps({"error": f"Skill not found: {skill_name}"})
+            return None, json.dumps({"error": f"Skill not found: {skill_name}"})
 
         script_path = skill.directory / "scripts" / script_name
         if not script_path.exists():
-            return json.dumps({"error": f"Script not found: {script_path}"})
+            return None, json.dumps({"error": f"Script not found: {script_path}"})
 
-        try:
-            result = subprocess.run(
-                ["python", str(script_path)] + args,
-                capture_output=True,
-                text=True,
-                timeout=120,
-                cwd=str(Path.cwd()),
-            )
+        return script_path, None
 
-            if result.returncode != 0:
-                return json.dumps({
-                    "error": result.stderr or "Script failed",
-                    "stdout": result.stdout,
-                })
+    def _script_result(self, returncode: int, stdout: str, stderr: str) -> str:
+        """Turn a finished script run into the tool result for the LLM."""
+        if returncode != 0:
+            return json.dumps({
+                "error": stderr or "Script failed",
+                "stdout": stdout,
+            })
+
+        if self.retrieval:
+            return self._index_paper_output(stdout)
+
+        return stdout
 
-            return result.stdout
+    def _run_script(self, skill_name: str, script_name: str, args: list) -> str:
+        """Run a script from a skill's scripts directory."""
+        script_path, error = self._resolve_script(skill_name, script_name)
+        if error:
+            return error
+
+        try:
+            if self.script_runner:
+                result = self.script_runner.run(
+                    script_path,
+                    args,
+                    timeout=SCRIPT_TIMEOUT,
+                    cwd=str(Path.cwd()),
+                )
+            else:
+                result = subprocess.run(
+                    ["python", str(script_path)] + args,
+                    capture_output=True,
+                    text=True,
+                    timeout=SCRIPT_TIMEOUT,
+                    cwd=str(Path.cwd()),
+                )
+
+            return self._script_result(result.returncode, result.stdout, result.stderr)
 
         except subprocess.TimeoutExpired:
             return json.dumps({"error": "Script timed out"})
         except Exception as e:
             return json.dumps({"error": str(e)})
 
+    def _index_paper_output(self, output: str) -> str:
+        """
+        Index extracted paper text and return a compact stand-in for it.
+
+        Script output that is not an extraction result is returned unchanged.
+        """
+        try:
+            paper = json.loads(output)
+        except json.JSONDecodeError:
+            return output
+        if not isinstance(paper, dict) or "sections" not in paper:
+            return output
+
+        index = PaperIndex.from_extraction(paper)
+        for key in (paper.get("source"), paper.get("pdf_path")):
+            if key:
+                self.papers[key] = index
+
+        return json.dumps({
+            "title": paper.get("title"),
+            "source": paper.get("source"),
+            "pdf_path": paper.get("pdf_path"),
+            "pages": paper.get("pages"),
+            "sections": index.outline(),
+            "indexed_passages": len(index.chunks),
+            "note": "Full text is indexed. Use search_paper to retrieve relevant passages.",
+        }, indent=2)
+
+    def _find_paper(self, paper: str) -> PaperIndex | None:
+        """Look up an indexed paper by source or PDF path, allowing partial matches."""
+        papers = list(self.papers.items())  # Other conversations may be indexing
+        return self.papers.get(paper) or next(
+            (idx for key, idx in papers if paper in key or key in paper),
+            None,
+        )
+
+    @staticmethod
+    def _conversation_paper(messages: list[dict]) -> str | None:
+        """
+        Source of the paper most recently read in a conversation.
+
+        Taken from an indexed read result in this run's tool messages, or
+        else from the read prompt ("Read the paper: <source>") in the
+        history.
+        """
+        for message in reversed(messages):
+            content = message.get("content") or ""
+            if message["role"] == "tool" and '"indexed_passages"' in content:
+                try:
+                    result = json.loads(content)
+                except json.JSONDecodeError:
+                    continue
+                if result.get("source") or result.get("pdf_path"):
+                    return result.get("source") or result.get("pdf_path")
+            elif message["role"] == "user":
+                match = READ_PAPER_PATTERN.search(content)
+                if match:
+                    return match.group(1)
+        return None
+
+    def _search_paper(
+        self,
+        query: str,
+        top_k: int = 5,
+        paper: str | None = None,
+        messages: list[dict] | None = None,
+    ) -> str:
+        """
+        Return the passages of an indexed paper that best match a query.
+
+        Without paper, the paper read in this conversation (messages) is
+        searched. Failing that, the only indexed paper is used; with
+        several indexed, the model has to name one.
+        """
+        if paper:
+            index = self._find_paper(paper)
+            if index is None:
+                return json.dumps({"error": f"Paper not read: {paper}"})
+        else:
+            source = self._conversation_paper(messages or [])
+            index = self._find_paper(source) if source else None
+            if index is None:
+                indexes = {id(idx): idx for idx in list(self.papers.values())}
+                if not indexes:
+                    return json.dumps({"error": "No paper has been read yet"})
+                if len(indexes) > 1:
+                    return json.dumps({
+                        "error": "Several papers have been read; pass paper as one of these",
+                        "papers": sorted(self.papers),
+                    })
+                index = next(iter(indexes.values()))
+
+        return json.dumps({
+            "paper": index.title,
+            "results": [
+                {"section": chunk.section, "score": round(score, 2), "text": chunk.text}
+                for chunk, score in index.search(query, k=top_k)
+            ],
+        }, indent=2)
+
+    def close(self):
+        """Shut down the warm script workers."""
+        if self.script_runner:
+            self.script_runner.close()
+
     def _read_file(self, path: str) -> str:
         """Read a file and return its contents."""
         try:
@@ -441,10 +976,76 @@ You have access to the following skills. Use the `use_skill` tool to activate a
         except Exception as e:
             return json.dumps({"error": str(e)})
 
+    def _compact(self, messages: list[dict]) -> list[dict]:
+        """Fit messages to the token budget, reporting any savings."""
+        messages, stats = self.token_budget.compact(messages)
+        self.last_compaction = stats
+        if stats.saved:
+            print(f"[token budget] {stats.tokens_before} -> {stats.tokens_after} tokens "
+                  f"(saved {stats.saved}; {stats.truncated} tool results truncated, "
+                  f"{stats.dropped} messages dropped)")
+        return messages
+
+    def _create_completion(self, on_token=None, **kwargs):
+        """
+        Get a chat completion, from the completion cache when possible.
+
+        With on_token, the completion is streamed and on_token is called
+        with each text delta as it arrives (a cached answer is delivered
+        as one delta).
+        """
+        key = cached = None
+        if self.completion_cache is not None:
+            key = self.completion_cache.key(**kwargs)
+            cached = self.completion_cache.get(key)
+
+        if cached is not None:
+            from openai.types.chat import ChatCompletion
+
+            response = ChatCompletion.model_validate(cached)
+            if on_token and response.choices[0].message.content:
+                on_token(response.choices[0].message.content)
+            return response
+
+        if on_token:
+            response = self._stream_api(on_token, **kwargs)
+        else:
+            response = self._call_api(**kwargs)
+
+        if key is not None:
+            self.completion_cache.put(key, response.model_dump(mode="json"))
+        return response
+
+    def _call_api(self, **kwargs):
+        """Call the chat completions API, honouring max_concurrent_requests."""
+        if self._request_slots is None:
+            return self.client.chat.completions.create(**kwargs)
+        with self._request_slots:
+            return self.client.chat.completions.create(**kwargs)
+
+    def _stream_api(self, on_token, **kwargs) -> "ChatCompletion":
+        """Stream a completion, forwarding text deltas to on_token."""
+        slots = self._request_slots or contextlib.nullcontext()
+        accumulator = StreamAccumulator()
+        # Hold the request slot until the stream is drained
+        with slots:
+            stream = self.client.chat.completions.create(
+                stream=True,
+                stream_options={"include_usage": True},
+                **kwargs,
+            )
+            for chunk in stream:
+                text = accumulator.add(chunk)
+                if text:
+                    on_token(text)
+        return accumulator.result()
+
     def run(
         self,
         user_input: str,
         conversation_history: list[dict] | None = None,
+        on_token=None,
+        conversation_state: dict | None = None,
     ) -> str:
         """
         Process user input and return the agent's response.
@@ -454,24 +1055,31 @@ You have access to the following skills. Use the `use_skill` tool to activate a
         2. Load skill instructions when activated
         3. Execute any needed tools
         4. Return the final response
-        """
-        # Build messages - LLM will choose skills dynamically
-        messages = [
-            {"role": "system", "content": self._build_system_prompt(self.active_skill)}
-        ]
 
-        if conversation_history:
-            messages.extend(conversation_history)
+        If on_token is given, every completion round is streamed and
+        on_token receives text as soon as the model produces it.
 
-        messages.append({"role": "user", "content": user_input})
+        conversation_state is a dict the caller keeps for one conversation
+        and passes to each of its turns. run() records the skill activated
+        in this turn under "active_skill", and the next turn's system prompt
+        includes that skill's instructions.
+        """
+        if self.watch_skills:
+            self.refresh_skills()
 
-        # Get tools
-        tools = self._get_tools()
+        # One snapshot for the whole run, so a concurrent refresh can never
+        # pair this prompt with another version's tools
+        state = self._skill_state
+        messages = self._start_messages(user_input, conversation_history, state, conversation_state)
+        tools = state.tools
 
         # Chat loop with tool execution
-        max_iterations = 10
-        for _ in range(max_iterations):
-            response = self.client.chat.completions.create(
+        for _ in range(MAX_TOOL_ITERATIONS):
+            if self.token_budget:
+                messages = self._compact(messages)
+
+            response = self._create_completion(
+                on_token=on_token,
                 model=self.model,
                 messages=messages,
                 tools=tools,
@@ -485,29 +1093,14 @@ You have access to the following skills. Use the `use_skill` tool to activate a
                 return assistant_message.content or ""
 
             # Add assistant message
-            messages.append({
-                "role": "assistant",
-                "content": assistant_message.content,
-                "tool_calls": [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments,
-                        },
-                    }
-                    for tc in assistant_message.tool_calls
-                ],
-            })
-
-            # Execute each tool call
-            for tool_call in assistant_message.tool_calls:
-                tool_name = tool_call.function.name
-                arguments = json.loads(tool_call.function.arguments)
-
-                result = self._execute_tool(tool_name, arguments)
-
+            messages.append(self._assistant_entry(assistant_message))
+            self._record_active_skill(messages[-1], state, conversation_state)
+            if on_token and assistant_message.content:
+                on_token("\n\n")  # Separate this round's text from the next
+
+            # Execute the tool calls, concurrently if there are several
+            results = self._execute_tool_calls(assistant_message.tool_calls, messages)
+            for tool_call, result in zip(assistant_message.tool_calls, results):
                 messages.append({
                     "role": "tool",
                     "tool_call_id": tool_call.id,
@@ -516,21 +1109,210 @@ You have access to the following skills. Use the `use_skill` tool to activate a
 
         return "Max iterations reached."
 
+    def _start_messages(
+        self,
+        user_input: str,
+        conversation_history: list[dict] | None,
+        state: "_SkillState",
+        conversation_state: dict | None = None,
+    ) -> list[dict]:
+        """Build the opening messages - LLM will choose skills dynamically."""
+        active_skill = None
+        if conversation_state and conversation_state.get("active_skill"):
+            active_skill = state.skills.get(conversation_state["active_skill"])
+        if active_skill is None:
+            active_skill = self._active_skill(conversation_history or [], state.skills)
+        messages = [
+            {"role": "system", "content": self._build_system_prompt(state, active_skill)}
+        ]
+
+        if conversation_history:
+            messages.extend(conversation_history)
+
+        messages.append({"role": "user", "content": user_input})
+        return messages
+
+    def _record_active_skill(
+        self,
+        assistant_entry: dict,
+        state: "_SkillState",
+        conversation_state: dict | None,
+    ) -> None:
+        """Remember a skill activated by this assistant turn in conversation_state."""
+        skill = self._active_skill([assistant_entry], state.skills)
+        if skill and conversation_state is not None:
+            conversation_state["active_skill"] = skill.name
+
+    @staticmethod
+    def _active_skill(messages: list[dict], skills: dict[str, Skill]) -> Skill | None:
+        """
+        The skill most recently activated in a conversation.
+
+        Derived from the use_skill calls in the messages (or the caller's
+        conversation_state) rather than stored on the agent, so
+        conversations sharing one agent (batch and concurrent pipelines)
+        never see each other's skill. Skills that no longer exist are
+        skipped.
+        """
+        for message in reversed(messages):
+            for tool_call in reversed(message.get("tool_calls") or []):
+                function = tool_call["function"]
+                if function["name"] != "use_skill":
+                    continue
+                try:
+                    skill_name = json.loads(function["arguments"]).get("skill_name")
+                except json.JSONDecodeError:
+                    continue
+                skill = skills.get(skill_name)
+                if skill:
+                    return skill
+        return None
+
+    @staticmethod
+    def _assistant_entry(assistant_message) -> dict:
+        """Convert an assistant message with tool calls back into request form."""
+        return {
+            "role": "assistant",
+            "content": assistant_message.content,
+            "tool_calls": [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments,
+                    },
+                }
+                for tc in assistant_message.tool_calls
+            ],
+        }
 
-def run_pipeline(paper_source: str, model: str = "gpt-4o-mini"):
+
+def run_pipeline(
+    paper_source: str,
+    model: str = "gpt-4o-mini",
+    concurrent: bool = False,
+    output_dir: str = "paper_reports",
+    resume: bool = False,
+    retrieval: bool = False,
+    token_budget: int | None = None,
+    completion_cache: CompletionCache | None = None,
+):
     """Run the automated paper analysis pipeline."""
-    agent = SkillAgent(model=model)
-    pipeline = PaperAnalysisPipeline(agent)
-    return pipeline.run(paper_source)
+    agent = SkillAgent(
+        model=model,
+        retrieval=retrieval,
+        token_budget=token_budget,
+        completion_cache=completion_cache,
+    )
+    pipeline = PaperAnalysisPipeline(agent, output_dir=output_dir)
+    try:
+        return pipeline.run(paper_source, concurrent=concurrent, resume=resume)
+    finally:
+        agent.close()
+
+
+def read_sources(path: str) -> list[str]:
+    """Read paper sources from a file: one per line, # starts a comment."""
+    with open(path, encoding="utf-8") as f:
+        lines = [line.split("#", 1)[0].strip() for line in f]
+    return [line for line in lines if line]
+
+
+def run_batch(
+    sources_file: str,
+    model: str = "gpt-4o-mini",
+    max_papers: int = 4,
+    max_llm_requests: int = 8,
+    concurrent: bool = False,
+    output_dir: str = "paper_reports",
+    resume: bool = False,
+    retrieval: bool = False,
+    token_budget: int | None = None,
+    completion_cache: CompletionCache | None = None,
+) -> list[dict]:
+    """
+    Run the analysis pipeline over every paper listed in sources_file.
 
+    Up to max_papers pipelines run at once, sharing one agent whose
+    in-flight LLM requests are capped at max_llm_requests. Each paper gets
+    its usual markdown report; a JSONL index with one record per paper
+    (source, status, report path or error, seconds) is written alongside
+    the reports as results come in. With resume, papers and steps already
+    checkpointed by an earlier batch are not re-run.
 
-def run_interactive():
+    Returns the index records in completion order.
+    """
+    sources = read_sources(sources_file)
+    agent = SkillAgent(
+        model=model,
+        max_concurrent_requests=max_llm_requests,
+        retrieval=retrieval,
+        token_budget=token_budget,
+        completion_cache=completion_cache,
+    )
+    pipeline = PaperAnalysisPipeline(agent, output_dir=output_dir)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    index_path = pipeline.output_dir / f"batch_{timestamp}.jsonl"
+
+    def analyze(source: str) -> dict:
+        started = time.perf_counter()
+        record = {"source": source}
+        try:
+            results = pipeline.run(source, verbose=False, concurrent=concurrent, resume=resume)
+            record.update(status="ok", report_path=results["report_path"])
+        except Exception as e:
+            record.update(status="error", error=str(e))
+        record["seconds"] = round(time.perf_counter() - started, 2)
+        return record
+
+    print(f"Analyzing {len(sources)} papers ({max_papers} at a time, "
+          f"up to {max_llm_requests} concurrent LLM requests)")
+
+    records = []
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_papers) as pool, \
+                open(index_path, "w", encoding="utf-8") as index:
+            futures = [pool.submit(analyze, source) for source in sources]
+            for future in as_completed(futures):
+                record = future.result()
+                records.append(record)
+                index.write(json.dumps(record) + "\n")
+                index.flush()
+                print(f"[{len(records)}/{len(sources)}] {record['status']}: "
+                      f"{record['source']} ({record['seconds']}s)")
+    finally:
+        agent.close()
+
+    elapsed = time.perf_counter() - started
+    succeeded = sum(1 for r in records if r["status"] == "ok")
+    papers_per_min = len(records) / elapsed * 60 if elapsed > 0 else 0.0
+    print(f"\nBatch complete: {succeeded}/{len(records)} succeeded in {elapsed:.1f}s "
+          f"({papers_per_min:.2f} papers/min)")
+    print(f"Index written to: {index_path}")
+
+    return records
+
+
+def run_interactive(
+    retrieval: bool = False,
+    token_budget: int | None = None,
+    completion_cache: CompletionCache | None = None,
+    watch_skills: bool = False,
+):
     """Run an interactive session with the skill-based agent."""
     print("=" * 60)
     print("Paper Analysis Agent (Claude-style Skills)")
     print("=" * 60)
 
-    agent = SkillAgent()
+    agent = SkillAgent(
+        retrieval=retrieval,
+        token_budget=token_budget,
+        completion_cache=completion_cache,
+        watch_skills=watch_skills,
+    )
 
     print("""
 Modes:
@@ -545,10 +1327,11 @@ Examples:
 - "Explain this paper simply for a non-expert"
 - "ELI5 this paper"
 
-Type 'quit' to exit.
+Type 'reload' to pick up edited skills, 'quit' to exit.
 """)
 
     conversation_history = []
+    conversation_state = {}
     pipeline = PaperAnalysisPipeline(agent)
 
     while True:
@@ -565,6 +1348,11 @@ Type 'quit' to exit.
             print("Goodbye!")
             break
 
+        if user_input.lower() == "reload":
+            if not agent.refresh_skills():
+                print("Skills unchanged")
+            continue
+
         # Check for pipeline command
         if user_input.lower().startswith("analyze "):
             paper_source = user_input[8:].strip()
@@ -573,33 +1361,141 @@ Type 'quit' to exit.
                 pipeline.run(paper_source)
                 # Reset conversation after pipeline
                 conversation_history = []
+                conversation_state = {}
                 continue
             else:
                 print("Please provide a paper source (arXiv ID, path, or URL)")
                 continue
 
-        print("\nAgent: Processing...\n")
+        print("\nAgent: ", end="", flush=True)
 
-        response = agent.run(user_input, conversation_history)
+        response = agent.run(
+            user_input, conversation_history, on_token=print_token,
+            conversation_state=conversation_state,
+        )
 
-        print(f"Agent: {response}")
+        print()
 
         conversation_history.append({"role": "user", "content": user_input})
         conversation_history.append({"role": "assistant", "content": response})
 
+    agent.close()
+
 
 def main():
     """Entry point - supports command line args or interactive mode."""
-    import sys
-
-    if len(sys.argv) > 1:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Analyze academic papers with skill-based agents. With a paper "
+            "source, runs the full pipeline; without one, starts interactive mode."
+        ),
+    )
+    parser.add_argument(
+        "paper_source",
+        nargs="*",
+        help="arXiv ID, PDF path, or URL",
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Run the summary, analysis, explanation and reproduction steps in parallel",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Analyze every paper listed in FILE (one source per line)",
+    )
+    parser.add_argument(
+        "--papers",
+        type=int,
+        default=4,
+        help="With --batch: papers analyzed at the same time (default: 4)",
+    )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=8,
+        help="With --batch: maximum concurrent LLM requests (default: 8)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="paper_reports",
+        help="Directory for reports (default: paper_reports)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip steps (and papers) already checkpointed by an earlier run",
+    )
+    parser.add_argument(
+        "--retrieval",
+        action="store_true",
+        help="Index paper text locally and let the LLM search it instead of reading it whole",
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=None,
+        help="Compact conversation history to keep each prompt under this many tokens",
+    )
+    parser.add_argument(
+        "--cache-completions",
+        action="store_true",
+        help="Answer repeated identical LLM requests from an on-disk cache",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=7 * 24,
+        help="With --cache-completions: hours before a cached completion expires (default: 168)",
+    )
+    parser.add_argument(
+        "--watch-skills",
+        action="store_true",
+        help="Interactive mode: reload edited SKILL.md files before every message",
+    )
+    args = parser.parse_args()
+    completion_cache = (
+        CompletionCache(ttl_seconds=args.cache_ttl * 3600)
+        if args.cache_completions
+        else None
+    )
+
+    if args.batch:
+        if args.paper_source:
+            parser.error("give either a paper source or --batch, not both")
+        run_batch(
+            args.batch,
+            max_papers=args.papers,
+            max_llm_requests=args.llm_concurrency,
+            concurrent=args.concurrent,
+            output_dir=args.output_dir,
+            resume=args.resume,
+            retrieval=args.retrieval,
+            token_budget=args.token_budget,
+            completion_cache=completion_cache,
+        )
+    elif args.paper_source:
         # Command line mode: python skill_agent.py <paper_source>
-        paper_source = " ".join(sys.argv[1:])
+        paper_source = " ".join(args.paper_source)
         print(f"Running pipeline for: {paper_source}")
-        run_pipeline(paper_source)
+        run_pipeline(
+            paper_source,
+            concurrent=args.concurrent,
+            output_dir=args.output_dir,
+            resume=args.resume,
+            retrieval=args.retrieval,
+            token_budget=args.token_budget,
+            completion_cache=completion_cache,
+        )
     else:
         # Interactive mode
-        run_interactive()
+        run_interactive(
+            retrieval=args.retrieval,
+            token_budget=args.token_budget,
+            completion_cache=completion_cache,
+            watch_skills=args.watch_skills,
+        )
 
 
 if __name__ == "__main__":
@@ -1,10 +1,18 @@
 """Skill loader - loads and manages markdown-based skills."""
 
+import heapq
+import math
 import os
 import re
+import threading
 import yaml
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from paper_index import tokenize
+
+# Score added when the input mentions a skill by name ("paper summarizer")
+NAME_MATCH_BONUS = 5.0
 
 
 @dataclass
@@ -36,6 +44,17 @@ class Skill:
         return list(scripts_dir.glob("*.py"))
 
 
+@dataclass
+class SkillChanges:
+    """Names of the skills a refresh added, updated or removed."""
+    added: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
 class SkillLoader:
     """
     Loads markdown-based skills from directories.
@@ -55,20 +74,91 @@ class SkillLoader:
         self.skills_dir = Path(skills_dir)
         self._skills: dict[str, Skill] = {}
 
+        # Inverted index over descriptions, rebuilt whenever skills load:
+        # token -> (IDF weight, names of the skills whose description has it)
+        self._index: dict[str, tuple[float, list[str]]] = {}
+        # First token of a skill name -> [(skill name, all name tokens)]
+        self._names: dict[str, list[tuple[str, tuple[str, ...]]]] = {}
+        # Load order, used to break score ties
+        self._order: dict[str, int] = {}
+
+        # SKILL.md path -> ((mtime_ns, size) when parsed, parsed skill or None)
+        self._parsed: dict[Path, tuple[tuple[int, int], Skill | None]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def skills(self) -> dict[str, Skill]:
+        """The currently loaded skills. Replaced, never mutated, on refresh."""
+        return self._skills
+
     def load_all(self) -> dict[str, Skill]:
         """Load all skills from the skills directory."""
-        if not self.skills_dir.exists():
-            return {}
+        with self._lock:
+            self._parsed = {}
+        self.refresh()
+        return self._skills
+
+    def refresh(self) -> SkillChanges:
+        """
+        Pick up skills added, edited or deleted since the last load.
 
-        for skill_dir in self.skills_dir.iterdir():
-            if skill_dir.is_dir():
+        Each SKILL.md is stat'ed and only re-parsed if its mtime or size
+        changed, so refreshing an unchanged directory costs one stat per
+        skill. The skill dict and match index are swapped in together.
+        """
+        with self._lock:
+            parsed = {}
+            for skill_dir in self._skill_dirs():
                 skill_file = skill_dir / "SKILL.md"
-                if skill_file.exists():
-                    skill = self._parse_skill_file(skill_file, skill_dir)
-                    if skill:
-                        self._skills[skill.name] = skill
+                try:
+                    stat = skill_file.stat()
+                except FileNotFoundError:
+                    continue
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                previous = self._parsed.get(skill_file)
+                if previous and previous[0] == stamp:
+                    parsed[skill_file] = previous
+                else:
+                    parsed[skill_file] = (stamp, self._parse_skill_file(skill_file, skill_dir))
+            self._parsed = parsed
 
-        return self._skills
+            skills = {skill.name: skill for _, skill in parsed.values() if skill}
+            changes = SkillChanges(
+                added=[name for name in skills if name not in self._skills],
+                updated=[
+                    name for name, skill in skills.items()
+                    if name in self._skills and skill != self._skills[name]
+                ],
+                removed=[name for name in self._skills if name not in skills],
+            )
+            if changes:
+                self._skills = skills
+                self._build_index()
+            return changes
+
+    def _skill_dirs(self) -> list[Path]:
+        if not self.skills_dir.exists():
+            return []
+        return [path for path in self.skills_dir.iterdir() if path.is_dir()]
+
+    def _build_index(self) -> None:
+        """Tokenize every description once and weight tokens by IDF."""
+        postings: dict[str, list[str]] = {}
+        names: dict[str, list[tuple[str, tuple[str, ...]]]] = {}
+        for skill in self._skills.values():
+            for token in set(tokenize(skill.description)):
+                postings.setdefault(token, []).append(skill.name)
+            name_tokens = tuple(tokenize(skill.name))
+            if name_tokens:
+                names.setdefault(name_tokens[0], []).append((skill.name, name_tokens))
+
+        n = len(self._skills)
+        self._index = {
+            token: (math.log(1 + n / len(skill_names)), skill_names)
+            for token, skill_names in postings.items()
+        }
+        self._names = names
+        self._order = {name: i for i, name in enumerate(self._skills)}
 
     def _parse_skill_file(self, filepath: Path, directory: Path) -> Skill | None:
         """Parse a SKILL.md file into a Skill object."""
@@ -126,29 +216,47 @@ class SkillLoader:
         """
         Find the best matching skill for user input.
 
-        Uses simple keyword matching. In production, you'd use
+        Uses keyword matching (see match_skills). In production, you'd use
         embeddings or the LLM for semantic matching.
         """
-        user_lower = user_input.lower()
+        matches = self.match_skills(user_input, k=1)
+        return matches[0][0] if matches else None
 
-        best_match = None
-        best_score = 0
+    def match_skills(self, user_input: str, k: int = 5) -> list[tuple[Skill, float]]:
+        """
+        Rank skills against user input, best first.
 
-        for skill in self._skills.values():
-            # Simple keyword matching on description
-            desc_words = set(skill.description.lower().split())
-            input_words = set(user_lower.split())
-            overlap = len(desc_words & input_words)
+        Each input token found in a skill's description scores its IDF
+        weight, so rare words count for more than ones every skill uses.
+        Naming a skill outright adds NAME_MATCH_BONUS. Only skills sharing
+        at least one token with the input are scored, so input made of rare
+        words touches few skills; a word most descriptions use (such as
+        "paper") still scores nearly every skill.
+        """
+        tokens = tokenize(user_input)
+        scores: dict[str, float] = {}
+        with self._lock:
+            skills, index, names, order = self._skills, self._index, self._names, self._order
 
-            # Also check skill name
-            if skill.name.replace("-", " ") in user_lower:
-                overlap += 5
+        for token in set(tokens):
+            entry = index.get(token)
+            if entry is None:
+                continue
+            idf, skill_names = entry
+            for name in skill_names:
+                scores[name] = scores.get(name, 0.0) + idf
 
-            if overlap > best_score:
-                best_score = overlap
-                best_match = skill
+        for i, token in enumerate(tokens):
+            for name, name_tokens in names.get(token, []):
+                if tuple(tokens[i:i + len(name_tokens)]) == name_tokens:
+                    scores[name] = scores.get(name, 0.0) + NAME_MATCH_BONUS
 
-        return best_match if best_score > 0 else None
+        best = heapq.nsmallest(
+            k,
+            scores.items(),
+            key=lambda item: (-item[1], order[item[0]]),
+        )
+        return [(skills[name], score) for name, score in best]
 
     def get_all_descriptions(self) -> list[dict]:
         """Get name and description for all skills (for LLM context)."""
@@ -0,0 +1,84 @@
+"""The skill activated in one turn must reach the next turn's system prompt."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fake_openai_server import start_server  # noqa: E402
+from skill_agent import ANALYSIS_STEPS, PaperAnalysisPipeline, SkillAgent  # noqa: E402
+
+ACTIVE = "## Active Skill: "
+
+# Each step only activates a skill, so no script runs
+RULES = [
+    {"match": r"read the paper", "rounds": [[{
+        "name": "use_skill", "arguments": {"skill_name": "paper-reader", "reason": "test"},
+    }]]},
+    {"match": r"summary", "rounds": [[{
+        "name": "use_skill", "arguments": {"skill_name": "paper-summarizer", "reason": "test"},
+    }]]},
+]
+
+
+class RecordingAgent(SkillAgent):
+    """Records the system prompt of every completion request, per user prompt."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.prompts: list[tuple[str, str]] = []
+
+    def _create_completion(self, on_token=None, **kwargs):
+        messages = kwargs["messages"]
+        user = [m["content"] for m in messages if m["role"] == "user"][-1]
+        self.prompts.append((user, messages[0]["content"]))
+        return super()._create_completion(on_token=on_token, **kwargs)
+
+    def system_prompts(self, user_prefix: str) -> list[str]:
+        return [system for user, system in self.prompts if user.startswith(user_prefix)]
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    server = start_server(rules=RULES)
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    agent = RecordingAgent(skills_dir=str(ROOT / "claude_skills"), warm_scripts=False)
+    yield agent
+    agent.close()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_step_two_sees_skill_from_step_one(agent, tmp_path, concurrent):
+    PaperAnalysisPipeline(agent, output_dir=str(tmp_path)).run(
+        "2301.00001", verbose=False, concurrent=concurrent,
+    )
+
+    read = agent.system_prompts("Read the paper")
+    assert ACTIVE not in read[0]
+
+    summary_prompt = ANALYSIS_STEPS[0][2]
+    summary = agent.system_prompts(summary_prompt)
+    assert f"{ACTIVE}paper-reader" in summary[0]
+
+
+def test_conversation_state_carries_skill_between_turns(agent):
+    state = {}
+    agent.run("Read the paper: 2301.00001", conversation_state=state)
+    assert state == {"active_skill": "paper-reader"}
+
+    agent.run("Give me a summary", conversation_state=state)
+    assert f"{ACTIVE}paper-reader" in agent.system_prompts("Give me a summary")[0]
+    assert state == {"active_skill": "paper-summarizer"}
+
+
+def test_conversations_do_not_share_skills(agent):
+    agent.run("Read the paper: 2301.00001", conversation_state={})
+    agent.run("Give me a summary", conversation_state={})
+    assert ACTIVE not in agent.system_prompts("Give me a summary")[0]
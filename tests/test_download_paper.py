@@ -0,0 +1,214 @@
+"""Resumable downloads and batch arXiv lookups in download_paper.py."""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "claude_skills" / "paper-reader" / "scripts"))
+
+import download_paper  # noqa: E402
+
+PDF_V1 = b"%PDF-1.4 version one " * 200
+PDF_V2 = b"%PDF-1.4 version two " * 200
+
+
+class _PaperServer(ThreadingHTTPServer):
+    """Serves one PDF with ETag, Range, If-Range and If-None-Match support."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.body, self.etag = PDF_V1, '"v1"'
+        self.drop_after = None  # Close the connection after this many body bytes, once
+        self.requests: list[dict] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/paper.pdf"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _PaperServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.send_header("ETag", server.etag)
+            self.end_headers()
+            return
+
+        body, start = server.body, 0
+        byte_range = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if byte_range and if_range in (None, server.etag):
+            start = int(byte_range.split("=")[1].rstrip("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        part = body[start:]
+        self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(part)))
+        self.end_headers()
+
+        if server.drop_after is not None:
+            part, server.drop_after = part[:server.drop_after], None
+            self.wfile.write(part)
+            self.close_connection = True
+            return
+        self.wfile.write(part)
+
+
+@pytest.fixture
+def server():
+    server = _PaperServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_dropped_connection_is_resumed(server, tmp_path, monkeypatch):
+    # Small chunks, so the bytes before the drop reach the .part file
+    monkeypatch.setattr(download_paper, "DOWNLOAD_CHUNK_SIZE", 256)
+    dest = str(tmp_path / "paper.pdf")
+    server.drop_after = 1024
+
+    headers = download_paper._stream_download(server.url, dest)
+
+    assert open(dest, "rb").read() == PDF_V1
+    assert headers["ETag"] == '"v1"'
+    assert server.requests[1]["Range"] == "bytes=1024-"
+    assert server.requests[1]["If-Range"] == '"v1"'
+    assert not os.path.exists(dest + ".part")
+    assert not os.path.exists(dest + ".part.json")
+
+
+def test_changed_resource_replaces_partial_file(server, tmp_path):
+    dest = str(tmp_path / "paper.pdf")
+    # A previous run stopped part way through version one
+    with open(dest + ".part", "wb") as f:
+        f.write(PDF_V1[:1000])
+    with open(dest + ".part.json", "w") as f:
+        json.dump({"etag": '"v1"', "last_modified": None}, f)
+    server.body, server.etag = PDF_V2, '"v2"'
+
+    download_paper._stream_download(server.url, dest)
+
+    assert server.requests[0]["If-Range"] == '"v1"'
+    assert open(dest, "rb").read() == PDF_V2
+
+
+def test_partial_file_without_validators_is_discarded(server, tmp_path):
+    dest = str(tmp_path / "paper.pdf")
+    with open(dest + ".part", "wb") as f:
+        f.write(b"stale bytes")
+
+    download_paper._stream_download(server.url, dest)
+
+    assert "Range" not in server.requests[0]
+    assert open(dest, "rb").read() == PDF_V1
+
+
+def test_revalidate_not_modified_keeps_cached_copy(server, tmp_path):
+    cache_dir = str(tmp_path)
+    path = download_paper.download_url(server.url, cache_dir)
+    fetched = download_paper.read_cache_metadata(path[:-len(".pdf")] + ".json")
+
+    assert download_paper.download_url(server.url, cache_dir, revalidate=True) == path
+    assert server.requests[-1]["If-None-Match"] == '"v1"'
+    assert open(path, "rb").read() == PDF_V1
+    metadata = download_paper.read_cache_metadata(path[:-len(".pdf")] + ".json")
+    assert metadata["etag"] == fetched["etag"] and "checked_at" in metadata
+
+
+def test_revalidate_changed_resource_downloads_new_copy(server, tmp_path):
+    cache_dir = str(tmp_path)
+    path = download_paper.download_url(server.url, cache_dir)
+    server.body, server.etag = PDF_V2, '"v2"'
+
+    download_paper.download_url(server.url, cache_dir, revalidate=True)
+
+    assert open(path, "rb").read() == PDF_V2
+    assert download_paper.read_cache_metadata(path[:-len(".pdf")] + ".json")["etag"] == '"v2"'
+
+
+class _FakePaper:
+    def __init__(self, short_id: str):
+        self.short_id = short_id
+        self.title = f"Title of {short_id}"
+
+    def get_short_id(self) -> str:
+        return self.short_id
+
+
+class _FakeClient:
+    """arxiv.Client stand-in that fails any query containing a poisoned ID."""
+
+    def __init__(self, known: list[str], poisoned: str | None = None):
+        self.known = known
+        self.poisoned = poisoned
+        self.queries: list[list[str]] = []
+
+    def results(self, search):
+        self.queries.append(list(search.id_list))
+        if self.poisoned in search.id_list:
+            raise RuntimeError("HTTP 400")
+        return iter(_FakePaper(f"{i}v1") for i in search.id_list if i in self.known)
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Replace PDF downloads with a stub; returns the IDs it was asked for."""
+    calls = []
+
+    def fake_fetch(arxiv_id, cache_dir, title=None, progress=None):
+        calls.append(arxiv_id)
+        return os.path.join(cache_dir, f"{arxiv_id}.pdf")
+
+    monkeypatch.setattr(download_paper, "_fetch_arxiv_pdf", fake_fetch)
+    return calls
+
+
+def test_batch_failed_chunk_only_fails_its_ids(tmp_path, fetched):
+    pytest.importorskip("arxiv")
+    ids = ["2301.00001", "2301.00002", "2301.00003", "2301.00004"]
+    client = _FakeClient(known=ids, poisoned="2301.00003")
+
+    results = download_paper.download_arxiv_batch(ids, str(tmp_path), chunk_size=2, client=client)
+
+    assert list(results) == ids
+    assert results["2301.00001"]["title"] == "Title of 2301.00001v1"
+    assert results["2301.00002"]["pdf_path"].endswith("2301.00002.pdf")
+    assert "query failed" in results["2301.00003"]["error"]
+    assert "query failed" in results["2301.00004"]["error"]
+    assert sorted(fetched) == ["2301.00001", "2301.00002"]
+
+
+def test_batch_skips_cached_and_malformed_ids(tmp_path, fetched):
+    pytest.importorskip("arxiv")
+    cache_path, _ = download_paper._arxiv_cache_paths("2301.00001", str(tmp_path))
+    Path(cache_path).write_bytes(PDF_V1)
+    client = _FakeClient(known=["2301.00002"])
+
+    results = download_paper.download_arxiv_batch(
+        ["arXiv:2301.00001", "2301.00002", "not-an-id", "2301.00009"], str(tmp_path), client=client,
+    )
+
+    assert results["2301.00001"]["pdf_path"] == cache_path
+    assert results["not-an-id"]["error"].startswith("Invalid arXiv ID")
+    assert results["2301.00009"]["error"].startswith("arXiv paper not found")
+    assert client.queries == [["2301.00002", "2301.00009"]]
+    assert fetched == ["2301.00002"]
@@ -0,0 +1,38 @@
+"""The fake server's default script must pick the right skill for each pipeline step."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fake_openai_server import Script  # noqa: E402
+from skill_agent import ANALYSIS_STEPS, READ_PROMPT  # noqa: E402
+
+STEP_SKILLS = {
+    "summary": "paper-summarizer",
+    "analysis": "paper-analyzer",
+    "explanation": "paper-explainer",
+    "reproduction": "paper-reproducer",
+}
+
+
+def _first_call(prompt: str) -> dict:
+    reply = Script().reply([{"role": "user", "content": prompt}])
+    function = reply["tool_calls"][0]["function"]
+    return {"name": function["name"], **json.loads(function["arguments"])}
+
+
+@pytest.mark.parametrize("key, prompt", [(key, prompt) for key, _, prompt in ANALYSIS_STEPS])
+def test_step_activates_its_skill(key, prompt):
+    assert _first_call(prompt) == {
+        "name": "use_skill", "skill_name": STEP_SKILLS[key], "reason": "scripted",
+    }
+
+
+def test_read_step_activates_paper_reader():
+    assert _first_call(READ_PROMPT.format(source="2301.00001"))["skill_name"] == "paper-reader"
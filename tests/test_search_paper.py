@@ -0,0 +1,72 @@
+"""search_paper must default to the paper of the calling conversation."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from skill_agent import READ_PROMPT, SkillAgent  # noqa: E402
+
+
+def _extraction(source: str, title: str, topic: str) -> str:
+    """download_paper.py output for a tiny paper about topic."""
+    return json.dumps({
+        "title": title,
+        "source": source,
+        "pdf_path": f"/tmp/{source}.pdf",
+        "pages": 1,
+        "sections": [
+            {"title": "Method", "page": 1, "start": 0, "end": 0,
+             "content": f"We train a {topic} model with a contrastive objective."},
+        ],
+    })
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    agent = SkillAgent(skills_dir=str(ROOT / "claude_skills"), warm_scripts=False, retrieval=True)
+    agent._index_paper_output(_extraction("2301.00001", "Paper A", "speech"))
+    agent._index_paper_output(_extraction("2301.00002", "Paper B", "vision"))
+    yield agent
+    agent.close()
+
+
+def _history(source: str) -> list[dict]:
+    return [
+        {"role": "user", "content": READ_PROMPT.format(source=source)},
+        {"role": "assistant", "content": "I have read the paper."},
+        {"role": "user", "content": "Summarize the method."},
+    ]
+
+
+@pytest.mark.parametrize("source, title", [("2301.00001", "Paper A"), ("2301.00002", "Paper B")])
+def test_default_is_the_conversations_paper(agent, source, title):
+    # Paper B was indexed last, but each conversation searches its own paper
+    result = json.loads(agent._search_paper("contrastive objective", messages=_history(source)))
+    assert result["paper"] == title
+
+
+def test_default_follows_read_result_in_the_same_run(agent):
+    read_result = agent._index_paper_output(_extraction("2301.00001", "Paper A", "speech"))
+    messages = [
+        {"role": "user", "content": "Read the paper arxiv:2301.00001 and find the objective"},
+        {"role": "tool", "tool_call_id": "call_1", "content": read_result},
+    ]
+    result = json.loads(agent._search_paper("objective", messages=messages))
+    assert result["paper"] == "Paper A"
+
+
+def test_no_default_with_several_papers_asks_for_one(agent):
+    result = json.loads(agent._search_paper("objective", messages=[{"role": "user", "content": "hi"}]))
+    assert "error" in result
+    assert "2301.00001" in result["papers"] and "2301.00002" in result["papers"]
+
+
+def test_explicit_paper_wins(agent):
+    result = json.loads(agent._search_paper("objective", paper="2301.00002", messages=_history("2301.00001")))
+    assert result["paper"] == "Paper B"
@@ -0,0 +1,142 @@
+"""Token budget - estimates prompt size and compacts chat history to fit."""
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Per-message framing overhead in chat-format prompts
+MESSAGE_OVERHEAD = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """The tiktoken encoding for model, or None when tiktoken is missing."""
+    try:
+        import tiktoken
+    except ImportError:  # Optional: fall back to a character-based estimate
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """
+    Estimate the token count of a string.
+
+    Uses tiktoken when installed; otherwise assumes ~4 characters per token,
+    which is close enough for budgeting English text and JSON.
+    """
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def message_tokens(message: dict, model: str = "gpt-4o-mini") -> int:
+    """Estimate the tokens one chat message adds to a prompt."""
+    tokens = MESSAGE_OVERHEAD + count_tokens(message.get("content") or "", model)
+    for tool_call in message.get("tool_calls") or []:
+        tokens += count_tokens(json.dumps(tool_call["function"]), model)
+    return tokens
+
+
+@dataclass
+class CompactionStats:
+    """Prompt size before and after one compaction."""
+    tokens_before: int
+    tokens_after: int
+    truncated: int = 0  # Tool results cut down to a stub
+    dropped: int = 0  # Messages removed entirely
+
+    @property
+    def saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+class TokenBudget:
+    """
+    Keeps a chat prompt under a token budget.
+
+    The system message and the most recent ``keep_recent`` messages are
+    never touched. Older messages are compacted from the oldest forwards in
+    two passes, stopping as soon as the prompt fits:
+
+    1. Stale tool results are cut to their first ``stub_chars`` characters
+       plus a note saying how much was removed.
+    2. Whole turns before the latest user message are dropped. An assistant
+       message is always dropped together with its tool results so the
+       history stays well-formed.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 100_000,
+        keep_recent: int = 6,
+        stub_chars: int = 500,
+        model: str = "gpt-4o-mini",
+    ):
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.stub_chars = stub_chars
+        self.model = model
+
+    def count(self, messages: list[dict]) -> int:
+        return sum(message_tokens(m, self.model) for m in messages)
+
+    def compact(self, messages: list[dict]) -> tuple[list[dict], CompactionStats]:
+        """Return a copy of messages that fits the budget, with statistics."""
+        sizes = [message_tokens(m, self.model) for m in messages]
+        total = sum(sizes)
+        stats = CompactionStats(tokens_before=total, tokens_after=total)
+        if total <= self.max_tokens:
+            return messages, stats
+
+        messages = list(messages)
+        first = 1 if messages and messages[0]["role"] == "system" else 0
+        recent_from = max(first, len(messages) - self.keep_recent)
+
+        # Pass 1: stub out old tool results
+        for i in range(first, recent_from):
+            if total <= self.max_tokens:
+                break
+            message = messages[i]
+            content = message.get("content") or ""
+            if message["role"] != "tool" or len(content) <= self.stub_chars:
+                continue
+
+            removed = count_tokens(content[self.stub_chars:], self.model)
+            stub = (
+                content[:self.stub_chars]
+                + f"\n... [{removed} tokens of earlier tool output removed to save context]"
+            )
+            messages[i] = {**message, "content": stub}
+            new_size = message_tokens(messages[i], self.model)
+            total += new_size - sizes[i]
+            sizes[i] = new_size
+            stats.truncated += 1
+
+        # Pass 2: drop whole turns that precede the current question
+        droppable_until = recent_from
+        for i in range(len(messages) - 1, first - 1, -1):
+            if messages[i]["role"] == "user":
+                droppable_until = min(droppable_until, i)
+                break
+
+        i = first
+        while total > self.max_tokens and i < droppable_until:
+            end = i + 1
+            while end < len(messages) and messages[end]["role"] == "tool":
+                end += 1
+            if end > droppable_until:
+                break  # Its tool results are protected; keep the pair intact
+            total -= sum(sizes[i:end])
+            stats.dropped += end - i
+            del messages[i:end], sizes[i:end]
+            droppable_until -= end - i
+
+        stats.tokens_after = total
+        return messages, stats